@@ -1,7 +1,252 @@
+import bisect
 import heapq
-from collections import defaultdict
-from typing import Dict, List, Tuple, Optional
+from array import array
+from typing import Dict, List, Tuple
 import math
+import threading
+
+try:
+    import numba
+except ImportError:  # numba is optional; the routing kernel also runs as plain Python
+    numba = None
+
+# Transport modes are interned as small ints when edges are added; names are
+# only looked up again when a path is turned back into output
+MODE_METRO, MODE_WALK, MODE_AUTO, MODE_BUS = range(4)
+MODES = {'metro': MODE_METRO, 'walk': MODE_WALK, 'auto': MODE_AUTO, 'bus': MODE_BUS}
+MODE_NAMES = ['metro', 'walk', 'auto', 'bus']
+
+_INF = float('inf')
+_MAX_EPOCH = 255  # Epoch stamps are one byte per node; clear them when they wrap
+
+# The indexed heap pays off once compiled; interpreted, C-backed heapq is faster
+_INDEXED_HEAP = numba is not None
+
+
+def _njit(func):
+    """JIT-compile func with numba when it is installed, else return it unchanged"""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@_njit
+def _heap_sift_up(heap_keys, heap_nodes, pos, i):
+    """Move slot i towards the root; slots are ordered by key, then node id"""
+    key = heap_keys[i]
+    node = heap_nodes[i]
+    while i > 0:
+        parent = (i - 1) // 2
+        parent_key = heap_keys[parent]
+        if parent_key < key or (parent_key == key and heap_nodes[parent] < node):
+            break
+        heap_keys[i] = parent_key
+        heap_nodes[i] = heap_nodes[parent]
+        pos[heap_nodes[i]] = i
+        i = parent
+    heap_keys[i] = key
+    heap_nodes[i] = node
+    pos[node] = i
+
+
+@_njit
+def _heap_sift_down(heap_keys, heap_nodes, pos, i, size):
+    """Move slot i towards the leaves; slots are ordered by key, then node id"""
+    key = heap_keys[i]
+    node = heap_nodes[i]
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        right = child + 1
+        if right < size and (heap_keys[right] < heap_keys[child] or
+                             (heap_keys[right] == heap_keys[child] and
+                              heap_nodes[right] < heap_nodes[child])):
+            child = right
+        child_key = heap_keys[child]
+        if key < child_key or (key == child_key and node < heap_nodes[child]):
+            break
+        heap_keys[i] = child_key
+        heap_nodes[i] = heap_nodes[child]
+        pos[heap_nodes[i]] = i
+        i = child
+    heap_keys[i] = key
+    heap_nodes[i] = node
+    pos[node] = i
+
+
+@_njit
+def _heap_push_or_decrease(heap_keys, heap_nodes, pos, size, node, key):
+    """
+    Indexed min-heap insert / decrease-key; pos[node] is the node's slot, or -1
+    when it isn't queued. Returns the new heap size.
+    """
+    i = pos[node]
+    if i < 0:
+        i = size
+        size += 1
+        heap_nodes[i] = node
+    heap_keys[i] = key
+    _heap_sift_up(heap_keys, heap_nodes, pos, i)
+    return size
+
+
+@_njit
+def _heap_pop_min(heap_keys, heap_nodes, pos, size):
+    """Remove the minimum node, marking it settled (pos = -2). Returns (node, new size)."""
+    node = heap_nodes[0]
+    size -= 1
+    if size > 0:
+        heap_keys[0] = heap_keys[size]
+        heap_nodes[0] = heap_nodes[size]
+        _heap_sift_down(heap_keys, heap_nodes, pos, 0, size)
+    pos[node] = -2
+    return node, size
+
+
+@_njit
+def _dijkstra_csr(row_ptr, edge_dst, edge_time, edge_cost, edge_dist, edge_mode,
+                  edge_norm_time, edge_norm_cost, edge_walk_penalty,
+                  start, end, weights, scratch, epoch, out_totals, out_path, out_edges, out_len):
+    """
+    Multi-criteria Dijkstra over CSR arrays, one run per strategy
+    weights holds a flat (cost, time, convenience) triple per strategy. Run r
+    writes (cost, time, distance) at out_totals[3r:3r + 3], its node ids and
+    incoming edge indices at out_path/out_edges[r * n:], and its node count
+    (0 if unreachable) at out_len[r]. Returns the last epoch used.
+    Library shortest-path routines (e.g. scipy.sparse.csgraph.dijkstra) can't
+    stand in for this, as they take fixed edge weights and the convenience
+    term depends on the mode of the edge a node was reached by.
+    """
+    (composite, norm_costs, norm_times, costs, times, dists,
+     transfers, previous, edge_idx, seen, heap_keys, heap_nodes, pos) = scratch
+    n = len(seen)
+    
+    for run in range(len(weights) // 3):
+        cost_w = weights[3 * run]
+        time_w = weights[3 * run + 1]
+        conv_w = weights[3 * run + 2]
+        
+        # A node's scratch entries (pos included) only count if stamped with
+        # this run's epoch, so nothing has to be cleared between runs
+        epoch += 1
+        if epoch == _MAX_EPOCH:
+            for i in range(n):
+                seen[i] = 0
+            epoch = 1
+        
+        seen[start] = epoch
+        composite[start] = 0.0
+        norm_costs[start] = 0.0
+        norm_times[start] = 0.0
+        costs[start] = 0.0
+        times[start] = 0.0
+        dists[start] = 0.0
+        transfers[start] = 0
+        previous[start] = -1
+        edge_idx[start] = -1
+        pos[start] = -1
+        
+        # Indexed heap (one slot per node) when compiled, else heapq with lazy deletion
+        size = 0
+        pq = [(0.0, start)]
+        if _INDEXED_HEAP:
+            size = _heap_push_or_decrease(heap_keys, heap_nodes, pos, size, start, 0.0)
+        
+        while True:
+            # Popping settles the node (pos = -2)
+            if _INDEXED_HEAP:
+                if size == 0:
+                    break
+                current, size = _heap_pop_min(heap_keys, heap_nodes, pos, size)
+            else:
+                if not pq:
+                    break
+                current = heapq.heappop(pq)[1]
+                if pos[current] == -2:
+                    continue
+                pos[current] = -2
+            
+            # Early exit if we reached destination. A bidirectional search can't
+            # replace this: the mode-change penalty where the two halves meet
+            # depends on both incoming modes, so their scores don't add up
+            if current == end:
+                break
+            
+            # Get previous mode (-1 at the start node)
+            prev_edge = edge_idx[current]
+            prev_mode = edge_mode[prev_edge] if prev_edge != -1 else -1
+            cur_norm_cost = norm_costs[current]
+            cur_norm_time = norm_times[current]
+            cur_transfers = transfers[current]
+            
+            for k in range(row_ptr[current], row_ptr[current + 1]):
+                neighbor = edge_dst[k]
+                
+                if seen[neighbor] == epoch and pos[neighbor] == -2:
+                    continue
+                
+                # Mode change as a 0/1 mask (never at the start node), so the
+                # transfer count and its penalty need no branches
+                mode = edge_mode[k]
+                mode_changed = int(prev_mode != mode) & int(prev_mode != -1)
+                new_norm_cost = cur_norm_cost + edge_norm_cost[k]
+                new_norm_time = cur_norm_time + edge_norm_time[k]
+                new_transfers = cur_transfers + mode_changed
+                mode_change_penalty = 0.3 * mode_changed
+                
+                # Composite score from the pre-normalized edge components
+                score = (
+                    cost_w * new_norm_cost +
+                    time_w * new_norm_time +
+                    conv_w * (new_transfers / 5.0 + mode_change_penalty + edge_walk_penalty[k])
+                )
+                
+                if seen[neighbor] != epoch:
+                    seen[neighbor] = epoch
+                    pos[neighbor] = -1
+                    composite[neighbor] = _INF
+                
+                if score < composite[neighbor]:
+                    composite[neighbor] = score
+                    norm_costs[neighbor] = new_norm_cost
+                    norm_times[neighbor] = new_norm_time
+                    costs[neighbor] = costs[current] + edge_cost[k]
+                    times[neighbor] = times[current] + edge_time[k]
+                    dists[neighbor] = dists[current] + edge_dist[k]
+                    transfers[neighbor] = new_transfers
+                    previous[neighbor] = current
+                    edge_idx[neighbor] = k
+                    if _INDEXED_HEAP:
+                        size = _heap_push_or_decrease(heap_keys, heap_nodes, pos, size,
+                                                      neighbor, score)
+                    else:
+                        heapq.heappush(pq, (score, neighbor))
+        
+        if seen[end] != epoch:
+            out_len[run] = 0
+            continue
+        
+        out_totals[3 * run] = costs[end]
+        out_totals[3 * run + 1] = times[end]
+        out_totals[3 * run + 2] = dists[end]
+        
+        # Walk the predecessors back from the end, then write the path forwards
+        length = 0
+        current = end
+        while current != -1:
+            length += 1
+            current = previous[current]
+        
+        current = end
+        for i in range(run * n + length - 1, run * n - 1, -1):
+            out_path[i] = current
+            out_edges[i] = edge_idx[current]
+            current = previous[current]
+        out_len[run] = length
+    
+    return epoch
+
 
 class LocationToLocationOptimizer:
     """
@@ -10,15 +255,26 @@ class LocationToLocationOptimizer:
     """
     
     def __init__(self):
-        self.graph = defaultdict(list)
+        # Edges are collected as parallel columns, then packed by _build_csr
+        self._edge_buffer = {'src': [], 'dst': [], 'mode': [], 'time': [], 'cost': [], 'dist': []}
         self.locations = {}  # All searchable locations
         self.metro_stations = {}
         
-        # Build complete network
+        # Build complete network. It is built eagerly rather than per query:
+        # at a few hundred edges it takes milliseconds, and the search kernel
+        # needs the finished CSR arrays to run compiled
         self._build_metro_network()
         self._add_popular_locations()
         self._connect_locations_to_metro()
         self._add_direct_connections()
+        
+        # Pack the network into integer-indexed arrays for routing
+        self._build_csr()
+        self._allocate_scratch()
+        
+        # Compile the routing kernel now so the first query doesn't pay for it
+        if numba is not None:
+            self._dijkstra(0, 0, [(1.0, 1.0, 1.0)])
     
     def _build_metro_network(self):
         """Build Kochi Metro network with coordinates"""
@@ -57,17 +313,15 @@ class LocationToLocationOptimizer:
             }
             self.metro_stations[name] = (lat, lon)
         
-        # Connect consecutive metro stations
-        stations_list = [name for name, _, _, _ in metro_data]
-        for i in range(len(stations_list) - 1):
-            station1 = stations_list[i]
-            station2 = stations_list[i + 1]
-            
+        # Station coordinates for nearest-station lookups
+        self._station_names = [name for name, _, _, _ in metro_data]
+        self._station_lats = [lat for _, lat, _, _ in metro_data]
+        self._station_lons = [lon for _, _, lon, _ in metro_data]
+        
+        # Connect consecutive metro stations, using the coordinates in metro_data
+        for (station1, lat1, lon1, _), (station2, lat2, lon2, _) in zip(metro_data, metro_data[1:]):
             time = 2.5  # Average 2.5 minutes between stations
-            distance = self._haversine_distance(
-                self.locations[station1]['lat'], self.locations[station1]['lon'],
-                self.locations[station2]['lat'], self.locations[station2]['lon']
-            )
+            distance = self._haversine_distance(lat1, lon1, lat2, lon2)
             cost = 5  # ₹5 per hop
             
             self._add_edge(station1, station2, 'metro', time, distance, cost)
@@ -120,7 +374,7 @@ class LocationToLocationOptimizer:
                 continue
             
             # Find 3 nearest metro stations
-            nearest_stations = self._find_nearest_metro_stations(location, k=3)
+            nearest_stations = self._nearest_metro_stations(loc_data['lat'], loc_data['lon'], k=3)
             
             for station, distance_km in nearest_stations:
                 # Walking connection (if < 1.5km) - reduced from 2km
@@ -148,38 +402,140 @@ class LocationToLocationOptimizer:
         """Add direct connections between nearby non-metro locations"""
         locations_list = [(name, data) for name, data in self.locations.items() 
                          if data['type'] != 'metro_station']
-        
-        for i, (loc1, data1) in enumerate(locations_list):
-            for loc2, data2 in locations_list[i+1:]:
-                distance = self._haversine_distance(
-                    data1['lat'], data1['lon'],
-                    data2['lat'], data2['lon']
-                )
-                
-                # Add auto connection if within 10km
-                if distance < 10:
-                    auto_time = distance * 3
-                    auto_cost = 20 + (distance * 12)
-                    self._add_edge(loc1, loc2, 'auto', auto_time, distance, auto_cost)
-                    self._add_edge(loc2, loc1, 'auto', auto_time, distance, auto_cost)
-                
-                # Add walking if within 1.5km
-                if distance < 1.5:
-                    walk_time = distance * 15
-                    walk_cost = distance * 5
-                    self._add_edge(loc1, loc2, 'walk', walk_time, distance, walk_cost)
-                    self._add_edge(loc2, loc1, 'walk', walk_time, distance, walk_cost)
+        lats = [data['lat'] for _, data in locations_list]
+        lons = [data['lon'] for _, data in locations_list]
+        
+        # Only pairs within the 10km auto radius can create edges; build each
+        # mode's edges column-wise and append them to the buffer in bulk
+        names = [name for name, _ in locations_list]
+        pairs = self._pairs_within(lats, lons, 10)
+        
+        # Add auto connection (every pair is within 10km), both directions
+        src = [names[i] for i, _, _ in pairs] + [names[j] for _, j, _ in pairs]
+        dst = src[len(pairs):] + src[:len(pairs)]
+        dist = [d for _, _, d in pairs] * 2
+        self._add_edges(src, dst, 'auto', [d * 3 for d in dist], dist,
+                        [20 + (d * 12) for d in dist])
+        
+        # Add walking if within 1.5km
+        near = [(i, j, d) for i, j, d in pairs if d < 1.5]
+        src = [names[i] for i, _, _ in near] + [names[j] for _, j, _ in near]
+        dst = src[len(near):] + src[:len(near)]
+        dist = [d for _, _, d in near] * 2
+        self._add_edges(src, dst, 'walk', [d * 15 for d in dist], dist,
+                        [d * 5 for d in dist])
+    
+    def _build_csr(self):
+        """Pack the edge buffer into CSR arrays indexed by location id"""
+        self.id_to_name = list(self.locations)
+        self.name_to_id = {name: i for i, name in enumerate(self.id_to_name)}
+        n = len(self.id_to_name)
+        
+        # Location types as small ints into a shared name table
+        self.type_names = list(dict.fromkeys(data['type'] for data in self.locations.values()))
+        type_ids = {name: i for i, name in enumerate(self.type_names)}
+        self.loc_types = array('b', [type_ids[self.locations[name]['type']] for name in self.id_to_name])
+        
+        buf = self._edge_buffer
+        src = [self.name_to_id[name] for name in buf['src']]
+        
+        # Stable sort keeps each node's edges in insertion order
+        order = sorted(range(len(src)), key=src.__getitem__)
+        
+        # Neighbors of node i live in edge_*[row_ptr[i]:row_ptr[i + 1]]
+        counts = [0] * n
+        for i in src:
+            counts[i] += 1
+        self.row_ptr = array('i', [0]) * (n + 1)
+        for i in range(n):
+            self.row_ptr[i + 1] = self.row_ptr[i] + counts[i]
+        
+        self.edge_dst = array('i', [self.name_to_id[buf['dst'][k]] for k in order])
+        self.edge_time = array('f', [buf['time'][k] for k in order])
+        self.edge_cost = array('f', [buf['cost'][k] for k in order])
+        self.edge_dist = array('f', [buf['dist'][k] for k in order])
+        self.edge_mode = array('b', [buf['mode'][k] for k in order])
+        self.num_edges = len(order)
+        del self._edge_buffer
+        
+        # Per-edge composite score components, so the search only adds them up
+        self.edge_norm_time = array('f', [t / 120.0 for t in self.edge_time])
+        self.edge_norm_cost = array('f', [c / 200.0 for c in self.edge_cost])
+        self.edge_walk_penalty = array('f', [
+            d * 0.2 if mode == MODE_WALK and d > 0.5 else 0.0
+            for d, mode in zip(self.edge_dist, self.edge_mode)
+        ])
+    
+    def _allocate_scratch(self):
+        """Allocate the per-node search buffers once, sized to the network"""
+        n = len(self.id_to_name)
+        
+        self._scratch = (
+            array('d', [0.0]) * n,  # composite score
+            array('d', [0.0]) * n,  # normalized cost
+            array('d', [0.0]) * n,  # normalized time
+            array('d', [0.0]) * n,  # cost
+            array('d', [0.0]) * n,  # time
+            array('d', [0.0]) * n,  # distance
+            array('i', [0]) * n,    # transfers
+            array('i', [0]) * n,    # previous node
+            array('i', [0]) * n,    # incoming edge index
+            array('B', [0]) * n,    # epoch the node was last reached in
+            array('d', [0.0]) * n,  # heap keys
+            array('i', [0]) * n,    # heap nodes
+            array('i', [0]) * n,    # heap slot of each node (-1 absent, -2 settled)
+        )
+        self._epoch = 0
+        self._search_lock = threading.Lock()  # The buffers are shared between calls
+        
+        self._out_totals = array('d')
+        self._out_path = array('i')
+        self._out_edges = array('i')
+        self._out_len = array('i')
+    
+    def __getstate__(self):
+        """Pickle the network only; search buffers and the lock are rebuilt"""
+        state = self.__dict__.copy()
+        for key in ('_scratch', '_epoch', '_search_lock',
+                    '_out_totals', '_out_path', '_out_edges', '_out_len'):
+            state.pop(key, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._allocate_scratch()
+    
+    def to_csr(self, weight: str = 'time') -> Tuple[array, array, array]:
+        """
+        Return the network as CSR arrays (row_ptr, edge_dst, weights)
+        weight selects the edge attribute: 'time', 'cost' or 'distance'
+        """
+        weights = {'time': self.edge_time, 'cost': self.edge_cost, 'distance': self.edge_dist}
+        if weight not in weights:
+            raise ValueError(f"Unknown edge weight '{weight}'")
+        return self.row_ptr, self.edge_dst, weights[weight]
     
     def _add_edge(self, from_loc: str, to_loc: str, mode: str, 
                   time: float, distance: float, cost: float):
         """Add directed edge to graph"""
-        self.graph[from_loc].append({
-            'destination': to_loc,
-            'mode': mode,
-            'time': time,
-            'distance': distance,
-            'cost': cost
-        })
+        buf = self._edge_buffer
+        buf['src'].append(from_loc)
+        buf['dst'].append(to_loc)
+        buf['mode'].append(MODES[mode])
+        buf['time'].append(time)
+        buf['cost'].append(cost)
+        buf['dist'].append(distance)
+    
+    def _add_edges(self, from_locs: List[str], to_locs: List[str], mode: str,
+                   times: List[float], distances: List[float], costs: List[float]):
+        """Add a batch of directed edges sharing one mode to graph"""
+        buf = self._edge_buffer
+        buf['src'].extend(from_locs)
+        buf['dst'].extend(to_locs)
+        buf['mode'].extend([MODES[mode]] * len(from_locs))
+        buf['time'].extend(times)
+        buf['cost'].extend(costs)
+        buf['dist'].extend(distances)
     
     def _haversine_distance(self, lat1: float, lon1: float, 
                            lat2: float, lon2: float) -> float:
@@ -197,22 +553,70 @@ class LocationToLocationOptimizer:
         
         return R * c
     
+    def _haversine_matrix(self, lats1: List[float], lons1: List[float],
+                          lats2: List[float], lons2: List[float]) -> List[List[float]]:
+        """Calculate distances in km from every (lats1, lons1) point to every (lats2, lons2) point"""
+        R = 6371  # Earth's radius in km
+        to_rad = math.pi / 180  # Same factor math.radians uses
+        
+        cos_lats2 = [math.cos(lat * to_rad) for lat in lats2]
+        matrix = []
+        
+        for lat1, lon1 in zip(lats1, lons1):
+            cos_lat1 = math.cos(lat1 * to_rad)
+            matrix.append([
+                R * 2 * math.asin(math.sqrt(
+                    math.sin((lat2 - lat1) * to_rad / 2)**2 +
+                    cos_lat1 * cos_lat2 * math.sin((lon2 - lon1) * to_rad / 2)**2
+                ))
+                for lat2, lon2, cos_lat2 in zip(lats2, lons2, cos_lats2)
+            ])
+        
+        return matrix
+    
+    def _pairs_within(self, lats: List[float], lons: List[float],
+                      radius_km: float) -> List[Tuple[int, int, float]]:
+        """Find all index pairs (i < j) closer than radius_km, in (i, j) order"""
+        R = 6371  # Earth's radius in km
+        
+        # Great-circle distance is never shorter than the latitude difference,
+        # so sweeping latitude-sorted points bounds the candidates for each one
+        max_dlat = math.degrees(radius_km / R)
+        order = sorted(range(len(lats)), key=lats.__getitem__)
+        sorted_lats = [lats[i] for i in order]
+        
+        pairs = []
+        for a, i in enumerate(order):
+            hi = bisect.bisect_right(sorted_lats, sorted_lats[a] + max_dlat)
+            candidates = order[a + 1:hi]
+            if not candidates:
+                continue
+            
+            row = self._haversine_matrix([lats[i]], [lons[i]],
+                                         [lats[j] for j in candidates],
+                                         [lons[j] for j in candidates])[0]
+            for j, distance in zip(candidates, row):
+                if distance < radius_km:
+                    pairs.append((min(i, j), max(i, j), distance))
+        
+        pairs.sort()
+        return pairs
+    
     def _find_nearest_metro_stations(self, location: str, k: int = 3) -> List[Tuple[str, float]]:
         """Find k nearest metro stations to a location"""
         if location not in self.locations:
             return []
         
         loc_data = self.locations[location]
-        distances = []
-        
-        for station, (lat, lon) in self.metro_stations.items():
-            dist = self._haversine_distance(
-                loc_data['lat'], loc_data['lon'], lat, lon
-            )
-            distances.append((station, dist))
+        return self._nearest_metro_stations(loc_data['lat'], loc_data['lon'], k)
+    
+    def _nearest_metro_stations(self, lat: float, lon: float, k: int = 3) -> List[Tuple[str, float]]:
+        """Find k nearest metro stations to a coordinate"""
+        # Distances to every station in one batch
+        row = self._haversine_matrix([lat], [lon], self._station_lats, self._station_lons)[0]
         
-        distances.sort(key=lambda x: x[1])
-        return distances[:k]
+        # Only the k closest are needed, so skip the full sort
+        return heapq.nsmallest(k, zip(self._station_names, row), key=lambda x: x[1])
     
     def find_optimized_routes(self, start_location: str, end_location: str) -> List[Dict]:
         """
@@ -236,26 +640,31 @@ class LocationToLocationOptimizer:
             {"name": "Most Convenient", "cost": 0.2, "time": 0.3, "conv": 0.5},
         ]
         
+        start_id = self.name_to_id[start_location]
+        end_id = self.name_to_id[end_location]
+        
+        # All strategies share one batched search. Each still needs its own run:
+        # the convenience score depends on the incoming mode, so a single
+        # multi-objective pass would have to label (location, mode) states and
+        # does several times more relaxations than these early-exit runs
+        results = self._dijkstra(
+            start_id,
+            end_id,
+            [(strategy["cost"], strategy["time"], strategy["conv"]) for strategy in strategies]
+        )
+        
         all_routes = []
         
-        for strategy in strategies:
-            result = self._dijkstra(
-                start_location,
-                end_location,
-                cost_weight=strategy["cost"],
-                time_weight=strategy["time"],
-                convenience_weight=strategy["conv"]
-            )
-            
-            if result and result['previous'][end_location] is not None:
-                path = self._reconstruct_path(start_location, end_location, result)
+        for strategy, result in zip(strategies, results):
+            if result['path']:
+                path = self._reconstruct_path(start_id, result)
                 
                 if path:  # Only add if path exists
                     all_routes.append({
                         'strategy': strategy["name"],
-                        'total_cost': round(result['costs'][end_location], 2),
-                        'total_time': round(result['times'][end_location], 1),
-                        'total_distance': round(result['distances_km'][end_location], 2),
+                        'total_cost': round(result['cost'], 2),
+                        'total_time': round(result['time'], 1),
+                        'total_distance': round(result['distance'], 2),
                         'num_segments': len(path) - 1,
                         'path': path
                     })
@@ -278,114 +687,48 @@ class LocationToLocationOptimizer:
         
         return unique_routes
     
-    def _dijkstra(self, start: str, end: str, cost_weight: float, 
-                  time_weight: float, convenience_weight: float) -> Optional[Dict]:
-        """Dijkstra's algorithm with multi-criteria optimization"""
-        
-        distances = {loc: float('inf') for loc in self.locations}
-        costs = {loc: float('inf') for loc in self.locations}
-        times = {loc: float('inf') for loc in self.locations}
-        distances_km = {loc: float('inf') for loc in self.locations}
-        transfers = {loc: 0 for loc in self.locations}
-        previous = {loc: None for loc in self.locations}
-        edge_info = {loc: None for loc in self.locations}  # Store edge details
-        
-        distances[start] = 0
-        costs[start] = 0
-        times[start] = 0
-        distances_km[start] = 0
-        transfers[start] = 0
-        
-        pq = [(0, start)]
-        visited = set()
-        
-        while pq:
-            current_dist, current = heapq.heappop(pq)
-            
-            if current in visited:
-                continue
-            
-            visited.add(current)
-            
-            # Early exit if we reached destination
-            if current == end:
-                break
+    def _dijkstra(self, start: int, end: int,
+                  weights: List[Tuple[float, float, float]]) -> List[Dict]:
+        """
+        Dijkstra's algorithm with multi-criteria optimization over the CSR arrays
+        Runs once per (cost, time, convenience) weight triple
+        """
+        n = len(self.id_to_name)
+        runs = len(weights)
+        flat_weights = array('d', [w for triple in weights for w in triple])
+        
+        with self._search_lock:
+            if len(self._out_len) < runs:
+                self._out_totals = array('d', [0.0]) * (3 * runs)
+                self._out_path = array('i', [0]) * (runs * n)
+                self._out_edges = array('i', [0]) * (runs * n)
+                self._out_len = array('i', [0]) * runs
             
-            # Check if current location has any edges
-            if current not in self.graph:
-                continue
+            self._epoch = _dijkstra_csr(
+                self.row_ptr, self.edge_dst, self.edge_time, self.edge_cost,
+                self.edge_dist, self.edge_mode, self.edge_norm_time,
+                self.edge_norm_cost, self.edge_walk_penalty, start, end, flat_weights,
+                self._scratch, self._epoch,
+                self._out_totals, self._out_path, self._out_edges, self._out_len
+            )
             
-            for edge in self.graph[current]:
-                neighbor = edge['destination']
-                
-                if neighbor in visited:
-                    continue
-                
-                new_cost = costs[current] + edge['cost']
-                new_time = times[current] + edge['time']
-                new_distance = distances_km[current] + edge['distance']
-                new_transfers = transfers[current]
-                
-                # Get previous mode
-                prev_mode = edge_info[current]['mode'] if edge_info[current] else None
-                
-                # Increment transfers if mode changes
-                if prev_mode and prev_mode != edge['mode']:
-                    new_transfers += 1
-                
-                # Convenience penalty for mode changes and walking
-                mode_change_penalty = 0
-                if prev_mode and prev_mode != edge['mode']:
-                    mode_change_penalty = 0.3
-                
-                # Add penalty for long walks
-                walk_penalty = 0
-                if edge['mode'] == 'walk' and edge['distance'] > 0.5:
-                    walk_penalty = edge['distance'] * 0.2
-                
-                # Normalize for fair comparison
-                norm_cost = new_cost / 200.0 if new_cost > 0 else 0
-                norm_time = new_time / 120.0 if new_time > 0 else 0
-                norm_transfers = new_transfers / 5.0 if new_transfers > 0 else 0
-                
-                # Composite score
-                composite = (
-                    cost_weight * norm_cost +
-                    time_weight * norm_time +
-                    convenience_weight * (norm_transfers + mode_change_penalty + walk_penalty)
-                )
-                
-                if composite < distances[neighbor]:
-                    distances[neighbor] = composite
-                    costs[neighbor] = new_cost
-                    times[neighbor] = new_time
-                    distances_km[neighbor] = new_distance
-                    transfers[neighbor] = new_transfers
-                    previous[neighbor] = current
-                    edge_info[neighbor] = edge  # Store edge details
-                    heapq.heappush(pq, (composite, neighbor))
-        
-        return {
-            'distances': distances,
-            'costs': costs,
-            'times': times,
-            'distances_km': distances_km,
-            'transfers': transfers,
-            'previous': previous,
-            'edge_info': edge_info
-        }
+            results = []
+            for run in range(runs):
+                base = run * n
+                length = self._out_len[run]
+                results.append({
+                    'cost': self._out_totals[3 * run],
+                    'time': self._out_totals[3 * run + 1],
+                    'distance': self._out_totals[3 * run + 2],
+                    'path': self._out_path[base:base + length].tolist(),
+                    'edges': self._out_edges[base:base + length].tolist()
+                })
+        
+        return results
     
-    def _reconstruct_path(self, start: str, end: str, result: Dict) -> List[Dict]:
+    def _reconstruct_path(self, start: int, result: Dict) -> List[Dict]:
         """Reconstruct the path with detailed information"""
-        path = []
-        current = end
-        
-        # Build path backwards
-        while current is not None:
-            path.append(current)
-            current = result['previous'][current]
-        
-        path.reverse()
+        path = result['path']
         
         # Validate path
         if not path or path[0] != start:
@@ -394,13 +737,15 @@ class LocationToLocationOptimizer:
         # Add detailed information
         detailed_path = []
         for i in range(len(path)):
-            loc = path[i]
+            node = path[i]
+            loc = self.id_to_name[node]
+            loc_type = self.type_names[self.loc_types[node]]
             
             if i == 0:
                 # Starting point
                 detailed_path.append({
                     'location': loc,
-                    'type': self.locations[loc]['type'],
+                    'type': loc_type,
                     'mode': 'start',
                     'segment_time': 0,
                     'segment_cost': 0,
@@ -408,22 +753,22 @@ class LocationToLocationOptimizer:
                 })
             else:
                 # Get edge info from result
-                edge = result['edge_info'][loc]
+                k = result['edges'][i]
                 
-                if edge:
+                if k != -1:
                     detailed_path.append({
                         'location': loc,
-                        'type': self.locations[loc]['type'],
-                        'mode': edge['mode'],
-                        'segment_time': round(edge['time'], 1),
-                        'segment_cost': round(edge['cost'], 2),
-                        'segment_distance': round(edge['distance'], 2)
+                        'type': loc_type,
+                        'mode': MODE_NAMES[self.edge_mode[k]],
+                        'segment_time': round(self.edge_time[k], 1),
+                        'segment_cost': round(self.edge_cost[k], 2),
+                        'segment_distance': round(self.edge_dist[k], 2)
                     })
                 else:
                     # Edge not found - shouldn't happen but handle gracefully
                     detailed_path.append({
                         'location': loc,
-                        'type': self.locations[loc]['type'],
+                        'type': loc_type,
                         'mode': 'unknown',
                         'segment_time': 0,
                         'segment_cost': 0,
@@ -437,6 +782,14 @@ class RouteOptimizerApp:
     
     def __init__(self):
         self.optimizer = LocationToLocationOptimizer()
+        
+        # Lowercased names for fuzzy search, built once
+        self._lower_names = [(name.lower(), name) for name in self.optimizer.locations]
+    
+    def _match_locations(self, query: str) -> List[str]:
+        """Find locations whose name contains query, ignoring case"""
+        query = query.lower()
+        return [name for lower, name in self._lower_names if query in lower]
     
     def display_available_locations(self):
         """Show all searchable locations"""
@@ -488,10 +841,8 @@ class RouteOptimizerApp:
             return
         
         # Fuzzy search for locations
-        start_matches = [loc for loc in self.optimizer.locations.keys() 
-                        if start.lower() in loc.lower()]
-        end_matches = [loc for loc in self.optimizer.locations.keys() 
-                      if end.lower() in loc.lower()]
+        start_matches = self._match_locations(start)
+        end_matches = self._match_locations(end)
         
         if not start_matches:
             print(f"❌ No locations found matching '{start}'")
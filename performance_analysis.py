@@ -4,59 +4,183 @@ Performance Analysis Script for Kochi Route Optimizer
 Measures: Computation Time, Memory Usage, Routes Generated
 """
 
+import argparse
+import bisect
+import csv
+import gc
+import hashlib
+import os
+import pickle
+import threading
 import time
 import tracemalloc
 import statistics
+import dijkstra
 from dijkstra import LocationToLocationOptimizer
 from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import sys
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; statistics and the running sums are used instead
+    np = None
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; RSS then comes from resource.getrusage
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # resource is POSIX-only
+    resource = None
+
+# tracemalloc.reset_peak is Python 3.9+
+_HAS_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+# Report order of the complexity tiers; any other tier is listed after these
+COMPLEXITY_ORDER = ['Simple', 'Medium', 'Complex', 'Long']
+
+# Evaluation bands: a value below BANDS[i] (and not below BANDS[i - 1]) gets LABELS[i]
+_TIME_BANDS = (0.1, 0.3, 0.5, 1.0)  # seconds
+_TIME_LABELS = ("Excellent", "Very Good", "Good", "Acceptable", "Needs Optimization")
+_MEMORY_BANDS = (20, 50, 100)  # MB
+_MEMORY_LABELS = ("Efficient", "Good", "Acceptable", "High")
+_ROUTES_BANDS = (2, 3, 4)  # route alternatives
+_ROUTES_LABELS = ("Limited", "Acceptable", "Good", "Optimal")
+
+# Benchmark routes and the built-network cache live next to this script
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TESTS_PATH = os.path.join(_SCRIPT_DIR, 'tests.csv')
+DEFAULT_GRAPH_CACHE = os.path.join(_SCRIPT_DIR, '.optimizer.cache')
+
+# Files the network is built from; the cache is keyed on their contents.
+# The network data is defined in dijkstra.py itself
+GRAPH_SOURCES = (dijkstra.__file__,)
+
+_CACHE_MAGIC = b'kochi-optimizer-cache 1\n'
 
 class PerformanceAnalyzer:
-    def __init__(self):
-        print("Initializing Route Optimizer...")
-        self.optimizer = LocationToLocationOptimizer()
-        print("✓ Optimizer initialized successfully!\n")
-        
-        # Test cases with varying complexity
-        self.test_cases = [
-            # Simple routes (direct metro)
-            ("Aluva Metro", "Pulinchodu Metro", "Simple"),
-            ("Edapally Metro", "Palarivattom Metro", "Simple"),
-            
-            # Medium routes (metro + connection)
-            ("Lulu Mall Edapally", "M.G Road Metro", "Medium"),
-            ("Medical Trust Hospital Edapally", "Oberon Mall", "Medium"),
-            
-            # Complex routes (multiple modes)
-            ("Aluva Town", "Fort Kochi", "Complex"),
-            ("Kakkanad Infopark", "Marine Drive", "Complex"),
-            ("CUSAT Campus", "Thripunithura Town", "Complex"),
-            
-            # Long distance routes
-            ("Aluva Metro", "Thripunithura Metro", "Long"),
-            ("Lulu Mall Edapally", "Fort Kochi", "Long"),
-        ]
+    def __init__(self, repeats: int = 20, trace_memory: bool = True, use_cache: bool = False,
+                 verbose: bool = True, graph_cache: str = DEFAULT_GRAPH_CACHE,
+                 tests_path: str = DEFAULT_TESTS_PATH):
+        # Timing repeats per route, and whether memory comes from tracemalloc
+        # (exact Python allocations) or cheaper process RSS readings
+        self.repeats = repeats
+        self.trace_memory = trace_memory or (psutil is None and resource is None)
+        
+        # Optional (start, end) -> routes memo. Off by default so the numbers
+        # show the real search cost; on, they show warm-cache lookups
+        self.use_cache = use_cache
+        self._route_cache: Dict[tuple, List] = {}
+        self._cache_hits = 0
+        self._cache_lookups = 0
+        
+        if verbose:
+            print("Initializing Route Optimizer...")
+        self.optimizer = self._load_optimizer(graph_cache)
+        
+        # Warm-up query so one-time first-call costs aren't charged to test 1
+        self.optimizer.find_optimized_routes("Aluva Metro", "Pulinchodu Metro")
+        if verbose:
+            print("✓ Optimizer initialized successfully!\n")
+        
+        # Graph size is fixed once the optimizer is built
+        self.V = len(self.optimizer.locations)  # Vertices
+        self.E = self.optimizer.num_edges  # Edges
+        
+        # Test cases with varying complexity, one (start, end, complexity) per row
+        self.tests_path = tests_path
+        self.test_cases = self._load_test_cases(tests_path)
         
         self.results = []
     
-    def measure_single_route(self, start: str, end: str) -> Dict:
-        """Measure performance for a single route calculation"""
-        
-        # Start memory tracking
-        tracemalloc.start()
-        
-        # Measure computation time
-        start_time = time.time()
+    def _load_test_cases(self, path: str) -> List[tuple]:
+        """Read (start, end, complexity) test cases from a CSV file with a header row"""
+        with open(path, newline='', encoding='utf-8') as f:
+            return [(row['start'], row['end'], row['complexity']) for row in csv.DictReader(f)]
+    
+    def _load_optimizer(self, cache_path: str = None) -> LocationToLocationOptimizer:
+        """Load the built optimizer from cache_path, rebuilding it when stale"""
+        if not cache_path:
+            return LocationToLocationOptimizer()
+        
+        key = self._graph_key()
+        optimizer = self._read_graph_cache(cache_path, key)
+        if optimizer is not None:
+            return optimizer
+        
+        optimizer = LocationToLocationOptimizer()
+        payload = pickle.dumps(optimizer, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(payload).hexdigest().encode()
+        try:
+            # Write to a private temp file, then move it into place in one step
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_CACHE_MAGIC + key + b'\n' + digest + b'\n' + payload)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Caching is best effort
+        return optimizer
+    
+    def _graph_key(self) -> bytes:
+        """Hex SHA-256 over the contents of the files the network is built from"""
+        h = hashlib.sha256()
+        for path in GRAPH_SOURCES:
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        return h.hexdigest().encode()
+    
+    def _read_graph_cache(self, cache_path: str, key: bytes):
+        """
+        The cached optimizer, or None if the cache is missing, stale or not trusted
+        Only a file owned by this user and writable by no one else is unpickled.
+        The payload digest lives in the same file, so it only catches a truncated
+        or corrupted write; the ownership check is what keeps out foreign pickles
+        """
+        try:
+            # This check is the actual guard against unpickling someone else's file
+            st = os.stat(cache_path)
+            if hasattr(os, 'getuid') and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+                return None
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        header = len(_CACHE_MAGIC) + len(key) + 1
+        digest_end = header + 64 + 1
+        if (not data.startswith(_CACHE_MAGIC)
+                or data[len(_CACHE_MAGIC):header] != key + b'\n'):
+            return None
+        payload = data[digest_end:]
+        # Integrity only: anyone who can rewrite the payload can rewrite its digest
+        if data[header:digest_end] != hashlib.sha256(payload).hexdigest().encode() + b'\n':
+            return None
         
         try:
-            routes = self.optimizer.find_optimized_routes(start, end)
-            
-            end_time = time.time()
-            computation_time = end_time - start_time
-            
-            # Get memory usage
-            current, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
+            optimizer = pickle.loads(payload)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        return optimizer if isinstance(optimizer, LocationToLocationOptimizer) else None
+    
+    def measure_single_route(self, start: str, end: str, include_routes: bool = False,
+                             measure_memory: bool = True) -> Dict:
+        """
+        Measure performance for a single route calculation
+        The routes themselves are only kept with include_routes, since holding
+        every test's routes would inflate later tests' memory readings.
+        With measure_memory off, memory_used_mb is left at 0 for a later pass
+        """
+        
+        # Time and memory are measured in separate passes, so the
+        # allocation tracing doesn't inflate the reported time
+        try:
+            routes, samples = self._time_route(start, end, self.repeats)
+            memory_used_mb = self._mem_route(start, end) if measure_memory else 0
             
             # Extract route information
             num_routes = len(routes) if routes and 'error' not in routes[0] else 0
@@ -64,52 +188,221 @@ class PerformanceAnalyzer:
             return {
                 'start': start,
                 'end': end,
-                'computation_time': computation_time,
-                'memory_used_mb': peak / (1024 * 1024),
+                'computation_time': statistics.median(samples),
+                'iqr_time': self._iqr(samples),
+                'memory_used_mb': memory_used_mb,
                 'routes_generated': num_routes,
                 'success': num_routes > 0,
-                'routes': routes if num_routes > 0 else None
+                'routes': routes if include_routes and num_routes > 0 else None
             }
             
         except Exception as e:
-            tracemalloc.stop()
             return {
                 'start': start,
                 'end': end,
                 'computation_time': 0,
+                'iqr_time': 0,
                 'memory_used_mb': 0,
                 'routes_generated': 0,
                 'success': False,
                 'error': str(e)
             }
     
-    def run_analysis(self):
-        """Run complete performance analysis"""
+    def _find_routes(self, start: str, end: str) -> List[Dict]:
+        """Run a route query, through the route cache when enabled"""
+        if not self.use_cache:
+            return self.optimizer.find_optimized_routes(start, end)
+        
+        key = (start, end)
+        self._cache_lookups += 1
+        routes = self._route_cache.get(key)
+        if routes is None:
+            routes = self.optimizer.find_optimized_routes(start, end)
+            self._route_cache[key] = routes
+        else:
+            self._cache_hits += 1
+        return routes
+    
+    def _time_route(self, start: str, end: str, repeats: int = 20):
+        """Time a route query, returning its routes and each repeat's time in seconds"""
+        samples = []
+        
+        # Collect up front and keep the collector out of the timed loop
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeats):
+                start_ns = time.perf_counter_ns()
+                routes = self._find_routes(start, end)
+                samples.append((time.perf_counter_ns() - start_ns) / 1e9)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        
+        return routes, samples
+    
+    def _iqr(self, samples: List[float]) -> float:
+        """Interquartile range of timing samples (0 for a single sample)"""
+        if len(samples) < 2:
+            return 0
+        q1, _, q3 = statistics.quantiles(samples, n=4)
+        return q3 - q1
+    
+    def _mem_route(self, start: str, end: str) -> float:
+        """Measure peak memory of one route query in MB"""
+        if not self.trace_memory and psutil is not None:
+            return self._rss_peak_route(start, end)
+        
+        if not self.trace_memory:
+            # ru_maxrss is in KB on Linux; only growth of the process peak shows up
+            before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self._find_routes(start, end)
+            after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return (after - before) / 1024
+        
+        # Inside a caller's tracing session, reset the peak and measure growth
+        # over what is already allocated; otherwise trace just this query
+        if tracemalloc.is_tracing() and _HAS_RESET_PEAK:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self._find_routes(start, end)
+            _, peak = tracemalloc.get_traced_memory()
+            return (peak - baseline) / (1024 * 1024)
+        
+        # Leave a caller's session running (only possible here before 3.9)
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            self._find_routes(start, end)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+        
+        return peak / (1024 * 1024)
+    
+    def _rss_peak_route(self, start: str, end: str, interval: float = 0.001) -> float:
+        """Peak RSS growth in MB during one query, sampled by a background thread"""
+        process = psutil.Process()
+        baseline = process.memory_info().rss
+        samples = [baseline]
+        done = threading.Event()
+        
+        def sample():
+            while not done.is_set():
+                samples.append(process.memory_info().rss)
+                time.sleep(interval)
+        
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            self._find_routes(start, end)
+        finally:
+            done.set()
+            sampler.join()
+        samples.append(process.memory_info().rss)
+        
+        return (max(samples) - baseline) / (1024 * 1024)
+    
+    def run_analysis(self, parallel: bool = False, include_routes: bool = True,
+                     report_file: str = None):
+        """
+        Run complete performance analysis
+        Tests run one by one in this process unless parallel is set; a process
+        pool is quicker but the timings then include CPU contention between tests.
+        include_routes keeps each test's routes on its result. With report_file,
+        each test's detailed block is written there as soon as it is measured,
+        so the routes don't have to be kept for a later save_detailed_report
+        """
         
         print("="*80)
         print("PERFORMANCE ANALYSIS - KOCHI ROUTE OPTIMIZER")
         print("="*80)
         print(f"\nRunning {len(self.test_cases)} test cases...\n")
         
-        for i, (start, end, complexity) in enumerate(self.test_cases, 1):
-            print(f"Test {i}/{len(self.test_cases)}: {start} → {end} ({complexity})")
-            
-            result = self.measure_single_route(start, end)
-            result['complexity'] = complexity
-            self.results.append(result)
-            
-            if result['success']:
-                print(f"  ✓ Time: {result['computation_time']:.4f}s | "
-                      f"Memory: {result['memory_used_mb']:.2f}MB | "
-                      f"Routes: {result['routes_generated']}")
+        report = None
+        if report_file:
+            report = open(report_file, 'w', encoding='utf-8', buffering=1 << 20)
+            report.writelines(self._report_header())
+        need_routes = include_routes or report is not None
+        
+        try:
+            # The route cache lives in this process, so cached runs stay serial
+            if not parallel or self.use_cache:
+                results = []
+                for start, end, complexity in self.test_cases:
+                    result = self.measure_single_route(start, end, need_routes, measure_memory=False)
+                    result['complexity'] = complexity
+                    results.append(result)
+                
+                # Memory pass for all tests under one tracing session; without
+                # reset_peak (Python < 3.9) each test traces on its own instead
+                shared_trace = self.trace_memory and _HAS_RESET_PEAK
+                if shared_trace:
+                    tracemalloc.start()
+                try:
+                    for i, result in enumerate(results, 1):
+                        if 'error' not in result:
+                            result['memory_used_mb'] = self._mem_route(result['start'], result['end'])
+                        self._emit_result(i, result, report, include_routes)
+                finally:
+                    if shared_trace:
+                        tracemalloc.stop()
+                self.results.extend(results)
             else:
-                print(f"  ✗ Failed: {result.get('error', 'Unknown error')}")
-            
-            print()
+                self.results.extend(self._run_parallel(need_routes, report, include_routes))
+        finally:
+            if report is not None:
+                report.close()
         
         print("="*80)
         print("ANALYSIS COMPLETE")
         print("="*80)
+        
+        if report is not None:
+            print(f"\n✓ Detailed report saved to: {report_file}")
+    
+    def _run_parallel(self, need_routes: bool = False, report=None,
+                      include_routes: bool = False) -> List[Dict]:
+        """Measure all test cases across worker processes, in test-case order"""
+        workers = min(len(self.test_cases), os.cpu_count() or 1)
+        results = [None] * len(self.test_cases)
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.repeats, self.trace_memory, self.tests_path)) as pool:
+            futures = {pool.submit(_worker, start, end, complexity, need_routes): i
+                       for i, (start, end, complexity) in enumerate(self.test_cases)}
+            
+            # Report each case as it finishes (report blocks land in finishing order)
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                self._emit_result(i + 1, results[i], report, include_routes)
+        
+        return results
+    
+    def _emit_result(self, number: int, result: Dict, report=None, include_routes: bool = True):
+        """Print one test's outcome, stream its report block, and drop routes no longer needed"""
+        self._print_result(number, result)
+        if report is not None:
+            report.writelines(self._format_result_block(result))
+        if not include_routes:
+            result['routes'] = None
+    
+    def _print_result(self, number: int, result: Dict):
+        """Print the outcome of one test case"""
+        print(f"Test {number}/{len(self.test_cases)}: {result['start']} → {result['end']} ({result['complexity']})")
+        
+        if result['success']:
+            print(f"  ✓ Time: {result['computation_time']:.4f}s | "
+                  f"Memory: {result['memory_used_mb']:.2f}MB | "
+                  f"Routes: {result['routes_generated']}")
+        else:
+            print(f"  ✗ Failed: {result.get('error', 'Unknown error')}")
+        
+        print()
     
     def generate_report(self):
         """Generate comprehensive performance report"""
@@ -120,139 +413,186 @@ class PerformanceAnalyzer:
             print("\n❌ No successful tests to analyze!")
             return
         
-        # Calculate statistics
-        computation_times = [r['computation_time'] for r in successful_tests]
-        memory_usage = [r['memory_used_mb'] for r in successful_tests]
-        routes_generated = [r['routes_generated'] for r in successful_tests]
-        
-        avg_time = statistics.mean(computation_times)
-        max_time = max(computation_times)
-        min_time = min(computation_times)
-        std_time = statistics.stdev(computation_times) if len(computation_times) > 1 else 0
+        # Calculate statistics in a single pass: running sums and extremes,
+        # Welford's update for the time variance, and per-complexity buckets
+        computation_times = []  # Kept for the median
+        n = 0
+        mean_time = m2_time = 0.0
+        sum_memory = sum_routes = 0.0
+        fastest = slowest = None
+        min_memory = max_memory = None
+        buckets = defaultdict(lambda: {'count': 0, 'time': 0.0, 'memory': 0.0})
+        
+        for r in successful_tests:
+            t = r['computation_time']
+            mem = r['memory_used_mb']
+            computation_times.append(t)
+            
+            n += 1
+            delta = t - mean_time
+            mean_time += delta / n
+            m2_time += delta * (t - mean_time)
+            
+            sum_memory += mem
+            sum_routes += r['routes_generated']
+            
+            if fastest is None or t < fastest['computation_time']:
+                fastest = r
+            if slowest is None or t > slowest['computation_time']:
+                slowest = r
+            if min_memory is None or mem < min_memory:
+                min_memory = mem
+            if max_memory is None or mem > max_memory:
+                max_memory = mem
+            
+            bucket = buckets[r['complexity']]
+            bucket['count'] += 1
+            bucket['time'] += t
+            bucket['memory'] += mem
+        
+        max_time = slowest['computation_time']
+        min_time = fastest['computation_time']
+        if np is not None:
+            # Vectorized aggregates scale to large repeat/test counts
+            times = np.asarray(computation_times, dtype=np.float64)
+            avg_time = float(times.mean())
+            median_time = float(np.median(times))
+            std_time = float(times.std(ddof=1)) if n > 1 else 0
+        else:
+            avg_time = mean_time
+            median_time = statistics.median(computation_times)
+            std_time = (m2_time / (n - 1)) ** 0.5 if n > 1 else 0
         
-        avg_memory = statistics.mean(memory_usage)
-        max_memory = max(memory_usage)
-        min_memory = min(memory_usage)
+        avg_memory = sum_memory / n
+        avg_routes = sum_routes / n
         
-        avg_routes = statistics.mean(routes_generated)
+        # The search kernel is numba-compiled when numba is installed
+        kernel = "numba JIT" if dijkstra.numba is not None else "pure Python"
         
-        # Print comprehensive report
-        print("\n" + "="*80)
-        print("ALGORITHM PERFORMANCE ANALYSIS")
-        print("="*80)
+        # Build the comprehensive report as lines
+        lines = []
+        lines.append("\n" + "="*80)
+        lines.append("ALGORITHM PERFORMANCE ANALYSIS")
+        lines.append("="*80)
         
-        print("\n┌─────────────────────────────────────────────────────────────────┐")
-        print("│                    COMPUTATIONAL EFFICIENCY                     │")
-        print("└─────────────────────────────────────────────────────────────────┘")
+        lines.append("\n┌─────────────────────────────────────────────────────────────────┐")
+        lines.append("│                    COMPUTATIONAL EFFICIENCY                     │")
+        lines.append("└─────────────────────────────────────────────────────────────────┘")
         
-        print(f"\n{'Metric':<35} {'Value':<20} {'Evaluation'}")
-        print("-" * 80)
+        lines.append(f"\n{'Metric':<35} {'Value':<20} {'Evaluation'}")
+        lines.append("-" * 80)
         
         # Computation Time
-        print(f"{'Average Computation Time':<35} {avg_time:.4f} seconds    {self._evaluate_time(avg_time)}")
-        print(f"{'Maximum Computation Time':<35} {max_time:.4f} seconds    {self._evaluate_time(max_time)}")
-        print(f"{'Minimum Computation Time':<35} {min_time:.4f} seconds    {self._evaluate_time(min_time)}")
-        print(f"{'Standard Deviation':<35} {std_time:.4f} seconds")
+        lines.append(f"{'Average Computation Time':<35} {avg_time:.4f} seconds    {self._evaluate_time(avg_time)}")
+        lines.append(f"{'Maximum Computation Time':<35} {max_time:.4f} seconds    {self._evaluate_time(max_time)}")
+        lines.append(f"{'Minimum Computation Time':<35} {min_time:.4f} seconds    {self._evaluate_time(min_time)}")
+        lines.append(f"{'Median Computation Time':<35} {median_time:.4f} seconds    {self._evaluate_time(median_time)}")
+        lines.append(f"{'Standard Deviation':<35} {std_time:.4f} seconds")
+        lines.append(f"{'Timing Repeats per Route':<35} {self.repeats}")
+        lines.append(f"{'Routing Kernel':<35} {kernel}")
         
-        print()
+        lines.append("")
         
         # Memory Usage
-        print(f"{'Average Memory Usage':<35} {avg_memory:.2f} MB          {self._evaluate_memory(avg_memory)}")
-        print(f"{'Maximum Memory Usage':<35} {max_memory:.2f} MB          {self._evaluate_memory(max_memory)}")
-        print(f"{'Minimum Memory Usage':<35} {min_memory:.2f} MB")
+        lines.append(f"{'Average Memory Usage':<35} {avg_memory:.2f} MB          {self._evaluate_memory(avg_memory)}")
+        lines.append(f"{'Maximum Memory Usage':<35} {max_memory:.2f} MB          {self._evaluate_memory(max_memory)}")
+        lines.append(f"{'Minimum Memory Usage':<35} {min_memory:.2f} MB")
         
-        print()
+        lines.append("")
         
         # Routes Generated
-        print(f"{'Average Routes Generated':<35} {avg_routes:.1f}              {self._evaluate_routes(avg_routes)}")
-        print(f"{'Success Rate':<35} {len(successful_tests)}/{len(self.results)} ({len(successful_tests)/len(self.results)*100:.1f}%)")
+        lines.append(f"{'Average Routes Generated':<35} {avg_routes:.1f}              {self._evaluate_routes(avg_routes)}")
+        lines.append(f"{'Success Rate':<35} {len(successful_tests)}/{len(self.results)} ({len(successful_tests)/len(self.results)*100:.1f}%)")
+        
+        if self.use_cache and self._cache_lookups:
+            hit_rate = self._cache_hits / self._cache_lookups * 100
+            lines.append(f"{'Route Cache Hit Rate':<35} {self._cache_hits}/{self._cache_lookups} ({hit_rate:.1f}%)")
         
         # Complexity Analysis
-        print("\n┌─────────────────────────────────────────────────────────────────┐")
-        print("│                    COMPLEXITY BREAKDOWN                         │")
-        print("└─────────────────────────────────────────────────────────────────┘")
-        
-        complexity_stats = {}
-        for complexity in ['Simple', 'Medium', 'Complex', 'Long']:
-            tests = [r for r in successful_tests if r['complexity'] == complexity]
-            if tests:
-                complexity_stats[complexity] = {
-                    'count': len(tests),
-                    'avg_time': statistics.mean([r['computation_time'] for r in tests]),
-                    'avg_memory': statistics.mean([r['memory_used_mb'] for r in tests])
-                }
-        
-        print(f"\n{'Complexity':<15} {'Tests':<10} {'Avg Time':<20} {'Avg Memory'}")
-        print("-" * 80)
+        lines.append("\n┌─────────────────────────────────────────────────────────────────┐")
+        lines.append("│                    COMPLEXITY BREAKDOWN                         │")
+        lines.append("└─────────────────────────────────────────────────────────────────┘")
+        
+        # Buckets were grouped during the stats pass; only ordering is left
+        tiers = [c for c in COMPLEXITY_ORDER if c in buckets]
+        tiers += sorted(c for c in buckets if c not in COMPLEXITY_ORDER)
+        complexity_stats = {
+            complexity: {
+                'count': buckets[complexity]['count'],
+                'avg_time': buckets[complexity]['time'] / buckets[complexity]['count'],
+                'avg_memory': buckets[complexity]['memory'] / buckets[complexity]['count']
+            }
+            for complexity in tiers
+        }
+        
+        lines.append(f"\n{'Complexity':<15} {'Tests':<10} {'Avg Time':<20} {'Avg Memory'}")
+        lines.append("-" * 80)
         for complexity, stats in complexity_stats.items():
-            print(f"{complexity:<15} {stats['count']:<10} {stats['avg_time']:.4f} seconds      {stats['avg_memory']:.2f} MB")
+            lines.append(f"{complexity:<15} {stats['count']:<10} {stats['avg_time']:.4f} seconds      {stats['avg_memory']:.2f} MB")
         
         # Time Complexity Verification
-        print("\n┌─────────────────────────────────────────────────────────────────┐")
-        print("│               TIME COMPLEXITY VERIFICATION                      │")
-        print("└─────────────────────────────────────────────────────────────────┘")
+        lines.append("\n┌─────────────────────────────────────────────────────────────────┐")
+        lines.append("│               TIME COMPLEXITY VERIFICATION                      │")
+        lines.append("└─────────────────────────────────────────────────────────────────┘")
         
-        V = len(self.optimizer.locations)  # Vertices
-        E = sum(len(edges) for edges in self.optimizer.graph.values())  # Edges
+        V = self.V
+        E = self.E
         
         theoretical_ops = (V + E) * (V ** 0.5)  # Approximation of (V+E)logV
         
-        print(f"\nGraph Statistics:")
-        print(f"  Vertices (V): {V}")
-        print(f"  Edges (E): {E}")
-        print(f"  Theoretical Complexity: O((V + E) log V)")
-        print(f"  Expected Operations: ~{theoretical_ops:.0f}")
-        print(f"\nActual Performance:")
-        print(f"  Average Time: {avg_time:.4f} seconds")
-        print(f"  Operations/Second: ~{theoretical_ops/avg_time if avg_time > 0 else 0:.0f}")
+        lines.append(f"\nGraph Statistics:")
+        lines.append(f"  Vertices (V): {V}")
+        lines.append(f"  Edges (E): {E}")
+        lines.append(f"  Theoretical Complexity: O((V + E) log V)")
+        lines.append(f"  Expected Operations: ~{theoretical_ops:.0f}")
+        lines.append(f"\nActual Performance:")
+        lines.append(f"  Average Time: {avg_time:.4f} seconds")
+        lines.append(f"  Operations/Second: ~{theoretical_ops/avg_time if avg_time > 0 else 0:.0f}")
         
         # Best and Worst Cases
-        print("\n┌─────────────────────────────────────────────────────────────────┐")
-        print("│                   BEST & WORST CASES                            │")
-        print("└─────────────────────────────────────────────────────────────────┘")
+        lines.append("\n┌─────────────────────────────────────────────────────────────────┐")
+        lines.append("│                   BEST & WORST CASES                            │")
+        lines.append("└─────────────────────────────────────────────────────────────────┘")
         
-        fastest = min(successful_tests, key=lambda x: x['computation_time'])
-        slowest = max(successful_tests, key=lambda x: x['computation_time'])
+        lines.append("\n🏆 FASTEST ROUTE:")
+        lines.append(f"  {fastest['start']} → {fastest['end']}")
+        lines.append(f"  Time: {fastest['computation_time']:.4f}s | Memory: {fastest['memory_used_mb']:.2f}MB")
         
-        print("\n🏆 FASTEST ROUTE:")
-        print(f"  {fastest['start']} → {fastest['end']}")
-        print(f"  Time: {fastest['computation_time']:.4f}s | Memory: {fastest['memory_used_mb']:.2f}MB")
-        
-        print("\n🐢 SLOWEST ROUTE:")
-        print(f"  {slowest['start']} → {slowest['end']}")
-        print(f"  Time: {slowest['computation_time']:.4f}s | Memory: {slowest['memory_used_mb']:.2f}MB")
+        lines.append("\n🐢 SLOWEST ROUTE:")
+        lines.append(f"  {slowest['start']} → {slowest['end']}")
+        lines.append(f"  Time: {slowest['computation_time']:.4f}s | Memory: {slowest['memory_used_mb']:.2f}MB")
         
         # Detailed Route Analysis
-        print("\n┌─────────────────────────────────────────────────────────────────┐")
-        print("│                  DETAILED ROUTE ANALYSIS                        │")
-        print("└─────────────────────────────────────────────────────────────────┘")
+        lines.append("\n┌─────────────────────────────────────────────────────────────────┐")
+        lines.append("│                  DETAILED ROUTE ANALYSIS                        │")
+        lines.append("└─────────────────────────────────────────────────────────────────┘")
         
-        print(f"\n{'Route':<50} {'Time(s)':<12} {'Memory(MB)':<12} {'Routes'}")
-        print("-" * 90)
+        lines.append(f"\n{'Route':<50} {'Time(s)':<12} {'IQR(s)':<12} {'Memory(MB)':<12} {'Routes'}")
+        lines.append("-" * 102)
         
         for result in successful_tests:
             route_str = f"{result['start'][:20]} → {result['end'][:20]}"
-            print(f"{route_str:<50} {result['computation_time']:<12.4f} {result['memory_used_mb']:<12.2f} {result['routes_generated']}")
+            lines.append(f"{route_str:<50} {result['computation_time']:<12.4f} {result['iqr_time']:<12.4f} {result['memory_used_mb']:<12.2f} {result['routes_generated']}")
         
         # Summary Table (For Presentation)
-        print("\n" + "="*80)
-        print("SUMMARY TABLE ")
-        print("="*80)
-        
-        print("\n┌────────────────────────────────┬──────────────────┬──────────────┐")
-        print("│ Metric                         │ Value            │ Evaluation   │")
-        print("├────────────────────────────────┼──────────────────┼──────────────┤")
-        print(f"│ Average Computation Time       │ {avg_time:.4f} seconds  │ {self._evaluate_time(avg_time):<12} │")
-        print(f"│ Maximum Computation Time       │ {max_time:.4f} seconds  │ {self._evaluate_time(max_time):<12} │")
-        print(f"│ Memory Usage                   │ ~{avg_memory:.2f} MB        │ {self._evaluate_memory(avg_memory):<12} │")
-        print(f"│ Routes Generated               │ {avg_routes:.1f}             │ {self._evaluate_routes(avg_routes):<12} │")
-        print("└────────────────────────────────┴──────────────────┴──────────────┘")
+        lines.append("\n" + "="*80)
+        lines.append("SUMMARY TABLE ")
+        lines.append("="*80)
+        
+        lines.append("\n┌────────────────────────────────┬──────────────────┬──────────────┐")
+        lines.append("│ Metric                         │ Value            │ Evaluation   │")
+        lines.append("├────────────────────────────────┼──────────────────┼──────────────┤")
+        lines.append(f"│ Average Computation Time       │ {avg_time:.4f} seconds  │ {self._evaluate_time(avg_time):<12} │")
+        lines.append(f"│ Maximum Computation Time       │ {max_time:.4f} seconds  │ {self._evaluate_time(max_time):<12} │")
+        lines.append(f"│ Memory Usage                   │ ~{avg_memory:.2f} MB        │ {self._evaluate_memory(avg_memory):<12} │")
+        lines.append(f"│ Routes Generated               │ {avg_routes:.1f}             │ {self._evaluate_routes(avg_routes):<12} │")
+        lines.append("└────────────────────────────────┴──────────────────┴──────────────┘")
         
         # Export data for PPT
-        print("\n" + "="*80)
-        print("DATA REPORT")
-        print("="*80)
-        print(f"""
+        lines.append("\n" + "="*80)
+        lines.append("DATA REPORT")
+        lines.append("="*80)
+        lines.append(f"""
 Average Computation Time: {avg_time:.4f} seconds ({self._evaluate_time(avg_time)})
 Maximum Computation Time: {max_time:.4f} seconds ({self._evaluate_time(max_time)})
 Minimum Computation Time: {min_time:.4f} seconds ({self._evaluate_time(min_time)})
@@ -264,93 +604,117 @@ Success Rate: {len(successful_tests)}/{len(self.results)} ({len(successful_tests
 Graph Statistics:
 - Vertices: {V}
 - Edges: {E}
+- Routing Kernel: {kernel}
 - Theoretical Complexity: O((V + E) log V) ≈ O({theoretical_ops:.0f})
 - Actual Operations/Second: ~{theoretical_ops/avg_time if avg_time > 0 else 0:.0f}
 """)
+        
+        # Emit the whole report in one write
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def _evaluate_time(self, time_seconds: float) -> str:
         """Evaluate computation time performance"""
-        if time_seconds < 0.1:
-            return "Excellent"
-        elif time_seconds < 0.3:
-            return "Very Good"
-        elif time_seconds < 0.5:
-            return "Good"
-        elif time_seconds < 1.0:
-            return "Acceptable"
-        else:
-            return "Needs Optimization"
+        return _TIME_LABELS[bisect.bisect_right(_TIME_BANDS, time_seconds)]
     
     def _evaluate_memory(self, memory_mb: float) -> str:
         """Evaluate memory usage"""
-        if memory_mb < 20:
-            return "Efficient"
-        elif memory_mb < 50:
-            return "Good"
-        elif memory_mb < 100:
-            return "Acceptable"
-        else:
-            return "High"
+        return _MEMORY_LABELS[bisect.bisect_right(_MEMORY_BANDS, memory_mb)]
     
     def _evaluate_routes(self, num_routes: float) -> str:
         """Evaluate number of routes generated"""
-        if num_routes >= 4:
-            return "Optimal"
-        elif num_routes >= 3:
-            return "Good"
-        elif num_routes >= 2:
-            return "Acceptable"
-        else:
-            return "Limited"
+        return _ROUTES_LABELS[bisect.bisect_right(_ROUTES_BANDS, num_routes)]
     
     def save_detailed_report(self, filename='performance_report.txt'):
         """Save detailed report to file"""
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("KOCHI ROUTE OPTIMIZER - PERFORMANCE ANALYSIS REPORT\n")
-            f.write("="*80 + "\n\n")
-            
-            for result in self.results:
-                f.write(f"Route: {result['start']} → {result['end']}\n")
-                f.write(f"Complexity: {result['complexity']}\n")
-                
-                if result['success']:
-                    f.write(f"Computation Time: {result['computation_time']:.4f} seconds\n")
-                    f.write(f"Memory Usage: {result['memory_used_mb']:.2f} MB\n")
-                    f.write(f"Routes Generated: {result['routes_generated']}\n")
-                    
-                    if result['routes']:
-                        f.write("\nRoute Details:\n")
-                        for i, route in enumerate(result['routes'], 1):
-                            f.write(f"  {i}. {route.get('strategy', 'Unknown')}: ")
-                            f.write(f"₹{route.get('total_cost', 0)} | ")
-                            f.write(f"{route.get('total_time', 0)} min | ")
-                            f.write(f"{route.get('total_distance', 0)} km\n")
-                else:
-                    f.write(f"Status: FAILED - {result.get('error', 'Unknown error')}\n")
-                
-                f.write("-"*80 + "\n\n")
+        lines = self._report_header()
+        for result in self.results:
+            lines.extend(self._format_result_block(result))
+        
+        # Build once, write once
+        with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(lines)
         
         print(f"\n✓ Detailed report saved to: {filename}")
+    
+    def _report_header(self) -> List[str]:
+        """Opening lines of the detailed report"""
+        return ["KOCHI ROUTE OPTIMIZER - PERFORMANCE ANALYSIS REPORT\n", "="*80 + "\n\n"]
+    
+    def _format_result_block(self, result: Dict) -> List[str]:
+        """Format one test's block of the detailed report"""
+        lines = [
+            f"Route: {result['start']} → {result['end']}\n",
+            f"Complexity: {result['complexity']}\n",
+        ]
+        
+        if result['success']:
+            lines.append(f"Computation Time: {result['computation_time']:.4f} seconds (median of {self.repeats}, IQR {result['iqr_time']:.4f})\n")
+            lines.append(f"Memory Usage: {result['memory_used_mb']:.2f} MB\n")
+            lines.append(f"Routes Generated: {result['routes_generated']}\n")
+            
+            if result['routes']:
+                lines.append("\nRoute Details:\n")
+                for i, route in enumerate(result['routes'], 1):
+                    lines.append(f"  {i}. {route.get('strategy', 'Unknown')}: "
+                                 f"₹{route.get('total_cost', 0)} | "
+                                 f"{route.get('total_time', 0)} min | "
+                                 f"{route.get('total_distance', 0)} km\n")
+        else:
+            lines.append(f"Status: FAILED - {result.get('error', 'Unknown error')}\n")
+        
+        lines.append("-"*80 + "\n\n")
+        return lines
+
+# Per-process analyzer for parallel runs, built once by _init_worker
+_worker_analyzer = None
+
+def _init_worker(repeats: int, trace_memory: bool, tests_path: str):
+    """Build the optimizer once in each worker process"""
+    global _worker_analyzer
+    # Build the network directly rather than have every worker race on the cache file
+    _worker_analyzer = PerformanceAnalyzer(repeats=repeats, trace_memory=trace_memory,
+                                           verbose=False, graph_cache=None,
+                                           tests_path=tests_path)
+
+def _worker(start: str, end: str, complexity: str, include_routes: bool = False) -> Dict:
+    """Measure one test case in a worker process"""
+    result = _worker_analyzer.measure_single_route(start, end, include_routes)
+    result['complexity'] = complexity
+    return result
 
 def main():
     """Main function to run performance analysis"""
     
+    parser = argparse.ArgumentParser(description="Performance analysis for the Kochi route optimizer")
+    parser.add_argument('--parallel', action='store_true',
+                        help="measure test cases concurrently in worker processes "
+                             "(faster, but timings include CPU contention)")
+    parser.add_argument('--cache', action='store_true',
+                        help="memoize routes per (start, end) so timings show warm-cache lookups "
+                             "(runs serially)")
+    parser.add_argument('--tests', default=DEFAULT_TESTS_PATH,
+                        help="CSV of test cases with start,end,complexity columns")
+    parser.add_argument('--rss', action='store_true',
+                        help="measure memory as process RSS (psutil or getrusage) instead of tracemalloc")
+    parser.add_argument('--no-save', action='store_true',
+                        help="skip the detailed file report (and keeping routes for it)")
+    args = parser.parse_args()
+    
     print("\n" + "🔍"*30)
     print("KOCHI ROUTE OPTIMIZER - PERFORMANCE ANALYSIS")
     print("🔍"*30 + "\n")
     
-    analyzer = PerformanceAnalyzer()
+    analyzer = PerformanceAnalyzer(tests_path=args.tests, trace_memory=not args.rss,
+                                   use_cache=args.cache)
     
-    # Run analysis
-    analyzer.run_analysis()
+    # Run analysis, streaming the detailed report as each test completes
+    report_file = None if args.no_save else 'performance_report.txt'
+    analyzer.run_analysis(parallel=args.parallel, include_routes=False, report_file=report_file)
     
     # Generate comprehensive report
     analyzer.generate_report()
     
-    # Save detailed report
-    analyzer.save_detailed_report()
-    
     print("\n" + "="*80)
     print("✓ Performance analysis complete!")
     print("="*80 + "\n")
@@ -1,12 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 import sys
-import webbrowser
-import folium
+import math
+import hashlib
 import os
-from pathlib import Path
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode
+from collections import OrderedDict
+from itertools import cycle, islice
+import weakref
 
 # Import from your main dijkstra.py file
 try:
@@ -15,11 +20,147 @@ except ImportError:
     print("Error: Make sure dijkstra.py is in the same directory")
     sys.exit(1)
 
+class _MapRequestHandler(BaseHTTPRequestHandler):
+    """Serves each cached map at /map/<map id>; evicted or unknown ids get a 404"""
+    
+    def do_GET(self):
+        prefix, _, map_id = self.path.split('?', 1)[0].rpartition('/')
+        data = self.server.maps.get(map_id) if prefix == '/map' else None
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        # Keep the console quiet
+        pass
+
+class _MapServer(ThreadingHTTPServer):
+    """Local HTTP server for rendered route maps, on a free port"""
+    daemon_threads = True
+    
+    def __init__(self, maps):
+        super().__init__(('127.0.0.1', 0), _MapRequestHandler)
+        # map id -> HTML bytes; shared with the GUI's map cache, which the
+        # Tk thread updates one (atomic) dict operation at a time
+        self.maps = maps
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+    
+    def url(self, map_id):
+        """Address of one cached map"""
+        return f"http://127.0.0.1:{self.server_address[1]}/map/{map_id}"
+    
+    def close(self):
+        """Stop serving and release the port"""
+        self.shutdown()
+        self.server_close()
+
+def simplify_path(points, epsilon):
+    """Ramer-Douglas-Peucker: drop points within epsilon of the simplified line"""
+    if len(points) < 3:
+        return points
+    
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (y1, x1), (y2, x2) = points[first], points[last]
+        dy, dx = y2 - y1, x2 - x1
+        norm = math.hypot(dx, dy)
+        
+        # Farthest point from the first-last chord
+        max_dist, index = 0.0, first
+        for i in range(first + 1, last):
+            y, x = points[i]
+            if norm:
+                dist = abs(dx * (y1 - y) - dy * (x1 - x)) / norm
+            else:
+                dist = math.hypot(x - x1, y - y1)
+            if dist > max_dist:
+                max_dist, index = dist, i
+        
+        if max_dist > epsilon:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    
+    return [p for p, k in zip(points, keep) if k]
+
 class LocationRouteGUI:
+    # Initial window size
+    WIDTH, HEIGHT = 1400, 900
+    
+    # Tk roots whose ttk styles are already set up; styles belong to the interpreter
+    _styled_roots = weakref.WeakSet()
+    
+    MAP_BUTTON_TEXT = "📍 View Route on Interactive Map"
+    
+    # Rendered maps kept for recently viewed (start, end) pairs
+    MAP_CACHE_SIZE = 16
+    
+    # Autocomplete keeps the full list until this many characters are typed
+    MIN_FILTER_LEN = 2
+    AC_DEBOUNCE_MS = 150  # Quiet time after the last key before filtering
+    
+    # Prompt text shown in the location comboboxes until a location is chosen
+    START_PLACEHOLDER = "Search or select starting location..."
+    DEST_PLACEHOLDER = "Search or select destination..."
+    # Lowercased, as autocomplete compares them to the lowercased entry text
+    PLACEHOLDERS = frozenset((START_PLACEHOLDER.lower(), DEST_PLACEHOLDER.lower()))
+    
+    # Quick filter name -> location type
+    FILTER_TYPES = {
+        'metro': 'metro_station',
+        'mall': 'mall',
+        'hospital': 'hospital',
+        'educational': 'educational'
+    }
+    
+    # Route card header colour, by strategy
+    STRATEGY_COLORS = {
+        'Cheapest': '#27ae60',
+        'Fastest': '#e74c3c',
+        'Balanced': '#3498db',
+        'Most Convenient': '#9b59b6'
+    }
+    
+    # (icon, label, colour) of each route card metric
+    CARD_METRICS = (
+        ("💰", "Cost", '#27ae60'),
+        ("⏱️", "Time", '#e67e22'),
+        ("📏", "Distance", '#3498db'),
+        ("🔄", "Segments", '#9b59b6')
+    )
+    
+    # Polyline points closer than this (degrees, about 1 m) to the line are dropped
+    LINE_EPSILON = 1e-5
+    
+    # Routes with more intermediate stops than this get them clustered on the map
+    CLUSTER_MIN_STOPS = 50
+    
+    # Color scheme for different routes on the map
+    ROUTE_COLORS = ('blue', 'red', 'green', 'purple', 'orange')
+    
+    # Icon shown beside each step of a route card, by transport mode
+    MODE_ICONS = {
+        'start': '🏁',
+        'metro': '🚇',
+        'bus': '🚌',
+        'auto': '🛺',
+        'walk': '🚶'
+    }
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Kochi Location-to-Location Route Optimizer with Maps")
-        self.root.geometry("1400x900")
+        self.root.geometry(f"{self.WIDTH}x{self.HEIGHT}")
         self.root.configure(bg='#f0f2f5')
         
         # Initialize the optimizer
@@ -33,17 +174,55 @@ class LocationRouteGUI:
         self.current_routes = None
         self.current_start = None
         self.current_end = None
+        self._start_ll = None
+        self._end_ll = None
+        self._map_cache = OrderedDict()  # Map id -> rendered map HTML bytes, oldest first
+        self._map_server = None  # Local server for the cached maps, started on first use
+        self._map_pending = None  # Map id being built in the background, if still wanted
+        self._card_pool = []  # Route card widgets, reused across searches
+        self._wheel_delta = 0  # Mousewheel movement not yet scrolled
+        self._wheel_pending = False
+        self._scrollregion_pending = False
+        
+        # Background workers for route calculation and map generation
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='gui-bg')
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Available locations
-        self.all_locations = sorted(list(self.optimizer.locations.keys()))
+        self.all_locations = tuple(sorted(self.optimizer.locations))
+        self._combo_values = {}  # Combobox -> values object it currently shows
+        
+        # Autocomplete index: lowercased names built once, matches memoized per query
+        self._loc_lower = [(loc.lower(), loc) for loc in self.all_locations]
+        self._ac_cache = {}
+        
+        # Bigram -> indices into _loc_lower of the names containing it
+        self._bigram_idx = {}
+        for i, (lower, _) in enumerate(self._loc_lower):
+            for j in range(len(lower) - 1):
+                self._bigram_idx.setdefault(lower[j:j + 2], set()).add(i)
+        self._ac_after_ids = {}  # Combobox -> its pending debounced autocomplete
+        
+        # [lat, lon] per location, as folium takes them
+        self._coords = {name: [d['lat'], d['lon']] for name, d in self.optimizer.locations.items()}
+        
+        # Sorted location names per type, for the quick filters
+        self._by_type = {}
+        for loc in self.all_locations:
+            self._by_type.setdefault(self.optimizer.locations[loc]['type'], []).append(loc)
+        self._type_counts = {t: len(locs) for t, locs in self._by_type.items()}
         
         # Setup GUI
         self.setup_styles()
         self.create_widgets()
         
     def setup_styles(self):
-        """Setup custom styles for the GUI"""
-        style = ttk.Style()
+        """Setup custom styles for the GUI, once per Tk root"""
+        if self.root in self._styled_roots:
+            return
+        self._styled_roots.add(self.root)
+        
+        style = ttk.Style(self.root)
         
         style.configure('Title.TLabel', 
                        font=('Segoe UI', 24, 'bold'),
@@ -63,6 +242,18 @@ class LocationRouteGUI:
     def create_widgets(self):
         """Create and layout all GUI widgets"""
         
+        # Status bar, for feedback that needs no dialog
+        self.status_var = tk.StringVar()
+        status_bar = tk.Label(self.root,
+                              textvariable=self.status_var,
+                              font=('Segoe UI', 9),
+                              bg='#ecf0f1',
+                              fg='#34495e',
+                              anchor='w',
+                              padx=10,
+                              pady=4)
+        status_bar.pack(side='bottom', fill='x')
+        
         # Main container
         main_frame = tk.Frame(self.root, bg='#f0f2f5')
         main_frame.pack(fill='both', expand=True, padx=20, pady=20)
@@ -141,7 +332,8 @@ class LocationRouteGUI:
                                        width=35,
                                        font=('Segoe UI', 10))
         self.start_combo.pack(fill='x', pady=(5, 0))
-        self.start_combo.set("Search or select starting location...")
+        self._combo_values[self.start_combo] = self.all_locations
+        self.start_combo.set(self.START_PLACEHOLDER)
         
         # Bind for autocomplete
         self.start_combo.bind('<KeyRelease>', lambda e: self.autocomplete(e, self.start_combo, self.start_location_var))
@@ -171,7 +363,8 @@ class LocationRouteGUI:
                                       width=35,
                                       font=('Segoe UI', 10))
         self.dest_combo.pack(fill='x', pady=(5, 0))
-        self.dest_combo.set("Search or select destination...")
+        self._combo_values[self.dest_combo] = self.all_locations
+        self.dest_combo.set(self.DEST_PLACEHOLDER)
         
         # Bind for autocomplete
         self.dest_combo.bind('<KeyRelease>', lambda e: self.autocomplete(e, self.dest_combo, self.end_location_var))
@@ -259,7 +452,7 @@ class LocationRouteGUI:
         
         # Interactive Map button
         self.view_map_btn = tk.Button(map_section,
-                                     text="📍 View Route on Interactive Map",
+                                     text=self.MAP_BUTTON_TEXT,
                                      font=('Segoe UI', 10, 'bold'),
                                      bg='#3498db',
                                      fg='white',
@@ -297,8 +490,7 @@ class LocationRouteGUI:
         stats_title.pack(pady=(8, 5))
         
         total_locs = len(self.optimizer.locations)
-        metro_count = len([l for l, d in self.optimizer.locations.items() 
-                          if d['type'] == 'metro_station'])
+        metro_count = self._type_counts.get('metro_station', 0)
         
         stats_text = f"""Total Locations: {total_locs}
 Metro Stations: {metro_count}
@@ -353,9 +545,7 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
                                                                anchor='nw')
         
         # Bind canvas resize
-        self.results_container.bind('<Configure>',
-                                   lambda e: self.results_canvas.configure(
-                                       scrollregion=self.results_canvas.bbox('all')))
+        self.results_container.bind('<Configure>', self._queue_scrollregion)
         
         # Bind mousewheel scrolling
         self.results_canvas.bind('<Enter>', self._bind_mousewheel)
@@ -392,6 +582,17 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
         # Progress bar (initially hidden)
         self.progress = ttk.Progressbar(results_frame, mode='indeterminate')
     
+    def _queue_scrollregion(self, event):
+        """Schedule a scrollregion update; a burst of resizes shares one"""
+        if not self._scrollregion_pending:
+            self._scrollregion_pending = True
+            self.root.after_idle(self._apply_scrollregion)
+    
+    def _apply_scrollregion(self):
+        """Fit the canvas scrollregion to the results"""
+        self._scrollregion_pending = False
+        self.results_canvas.configure(scrollregion=self.results_canvas.bbox('all'))
+    
     def _bind_mousewheel(self, event):
         """Bind mousewheel to canvas scrolling"""
         self.results_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
@@ -401,41 +602,74 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
         self.results_canvas.unbind_all("<MouseWheel>")
         
     def _on_mousewheel(self, event):
-        """Handle mousewheel scrolling"""
-        self.results_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        """Handle mousewheel scrolling, coalescing a burst of wheel events into one scroll"""
+        self._wheel_delta += event.delta
+        if not self._wheel_pending:
+            self._wheel_pending = True
+            self.root.after_idle(self._flush_mousewheel)
+    
+    def _flush_mousewheel(self):
+        """Scroll the canvas by the wheel movement gathered since the last flush"""
+        self._wheel_pending = False
+        # Whole notches scroll now; any remainder carries over to the next burst
+        units = int(-self._wheel_delta / 120)
+        self._wheel_delta += units * 120
+        if units:
+            self.results_canvas.yview_scroll(units, "units")
         
     def autocomplete(self, event, combobox, var):
-        """Autocomplete for location search"""
-        typed = var.get().lower()
+        """Autocomplete for location search, debounced so a burst of keys filters once"""
+        # Each combobox debounces on its own, so typing in one never drops the other's filter
+        after_id = self._ac_after_ids.get(combobox)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+        self._ac_after_ids[combobox] = self.root.after(self.AC_DEBOUNCE_MS, self._run_ac,
+                                                       combobox, var)
+    
+    def _run_ac(self, combobox, var):
+        """Filter a combobox's values by what has been typed into it"""
+        self._ac_after_ids.pop(combobox, None)
+        typed = var.get().lower().strip()
         
-        if typed == '' or typed == "search or select starting location..." or typed == "search or select destination...":
-            combobox['values'] = self.all_locations
+        if len(typed) < self.MIN_FILTER_LEN or typed in self.PLACEHOLDERS:
+            self._set_values(combobox, self.all_locations)
         else:
-            matches = [loc for loc in self.all_locations if typed in loc.lower()]
-            combobox['values'] = matches
+            matches = self._ac_cache.get(typed)
+            if matches is None:
+                matches = tuple(self._loc_lower[i][1] for i in self._ac_candidates(typed)
+                                if typed in self._loc_lower[i][0])
+                self._ac_cache[typed] = matches
+            self._set_values(combobox, matches)
+    
+    def _ac_candidates(self, typed):
+        """Indices of names holding every bigram of typed, in sorted name order"""
+        if len(typed) < 2:
+            return range(len(self._loc_lower))
+        
+        candidates = None
+        for j in range(len(typed) - 1):
+            ids = self._bigram_idx.get(typed[j:j + 2])
+            if not ids:
+                return ()
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return ()
+        return sorted(candidates)
+    
+    def _set_values(self, combobox, values):
+        """Set a combobox's values, skipping the Tcl round-trip if they are already shown"""
+        if self._combo_values.get(combobox) is not values:
+            combobox['values'] = values
+            self._combo_values[combobox] = values
     
     def filter_locations(self, location_type):
         """Filter locations by type"""
-        filtered = []
-        
-        type_map = {
-            'metro': 'metro_station',
-            'mall': 'mall',
-            'hospital': 'hospital',
-            'educational': 'educational'
-        }
-        
-        target_type = type_map.get(location_type, location_type)
-        
-        for loc, data in self.optimizer.locations.items():
-            if data['type'] == target_type:
-                filtered.append(loc)
-        
-        filtered = sorted(filtered)
+        target_type = self.FILTER_TYPES.get(location_type, location_type)
+        filtered = self._by_type.get(target_type, [])
         
         if filtered:
-            self.start_combo['values'] = filtered
-            self.dest_combo['values'] = filtered
+            self._set_values(self.start_combo, filtered)
+            self._set_values(self.dest_combo, filtered)
             
             messagebox.showinfo("Filter Applied",
                               f"Showing {len(filtered)} locations of type: {location_type}\n"
@@ -446,8 +680,8 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
     
     def reset_filters(self):
         """Reset location filters"""
-        self.start_combo['values'] = self.all_locations
-        self.dest_combo['values'] = self.all_locations
+        self._set_values(self.start_combo, self.all_locations)
+        self._set_values(self.dest_combo, self.all_locations)
     
     def swap_locations(self):
         """Swap start and end locations"""
@@ -462,11 +696,11 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
         start = self.start_location_var.get()
         end = self.end_location_var.get()
         
-        if not start or start == "Search or select starting location...":
+        if not start or start == self.START_PLACEHOLDER:
             messagebox.showerror("Error", "Please select a starting location")
             return False
         
-        if not end or end == "Search or select destination...":
+        if not end or end == self.DEST_PLACEHOLDER:
             messagebox.showerror("Error", "Please select a destination")
             return False
         
@@ -489,23 +723,19 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
         if not self.validate_inputs():
             return
         
-        # Disable button
+        # Disable button; a map still being built is for the old routes
         self.calculate_btn.config(state='disabled', text="Calculating...")
-        self.view_map_btn.config(state='disabled')
+        self.view_map_btn.config(state='disabled', text=self.MAP_BUTTON_TEXT)
+        self._map_pending = None
         self.gmaps_btn.config(state='disabled')
         self.progress.pack(fill='x', padx=10, pady=10)
         self.progress.start()
         
-        # Clear previous results
-        for widget in self.results_container.winfo_children():
-            widget.destroy()
-        
+        # Previous results stay up until the new ones replace them
         self.results_header.config(text="Calculating optimal routes...")
         
-        # Run in separate thread
-        thread = threading.Thread(target=self._calculate_routes_thread)
-        thread.daemon = True
-        thread.start()
+        # Run on a background worker
+        self._executor.submit(self._calculate_routes_thread)
     
     def _calculate_routes_thread(self):
         """Thread function for route calculation"""
@@ -533,8 +763,7 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
         self.results_header.config(text=f"Routes: {start} → {end}")
         
         # Clear container
-        for widget in self.results_container.winfo_children():
-            widget.destroy()
+        self._clear_results()
         
         if not routes or (isinstance(routes, list) and len(routes) > 0 and 'error' in routes[0]):
             error_msg = routes[0].get('error', 'No routes found') if routes else 'No routes found'
@@ -553,8 +782,13 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
         self.current_start = start
         self.current_end = end
         
+        # "lat,lon" of both ends, as the Google Maps URL takes them
+        (start_lat, start_lon), (end_lat, end_lon) = self._coords[start], self._coords[end]
+        self._start_ll = f"{start_lat},{start_lon}"
+        self._end_ll = f"{end_lat},{end_lon}"
+        
         # Enable map buttons
-        self.view_map_btn.config(state='normal')
+        self.view_map_btn.config(state='normal', text=self.MAP_BUTTON_TEXT)
         self.gmaps_btn.config(state='normal')
         
         # Display each route
@@ -565,7 +799,18 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
         self.results_canvas.yview_moveto(0)
     
     def _create_route_card(self, route, index):
-        """Create a card for each route alternative"""
+        """Show a card for a route alternative, reusing a pooled card when one is free"""
+        if index <= len(self._card_pool):
+            card = self._card_pool[index - 1]
+        else:
+            card = self._build_route_card()
+            self._card_pool.append(card)
+        
+        self._fill_route_card(card, route, index)
+        card['frame'].pack(fill='x', padx=15, pady=10)
+    
+    def _build_route_card(self):
+        """Build the widgets of an empty route card; returns the parts that change per route"""
         # Card container
         card = tk.Frame(self.results_container,
                        bg='white',
@@ -573,41 +818,24 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
                        borderwidth=2,
                        highlightbackground='#3498db',
                        highlightthickness=1)
-        card.pack(fill='x', padx=15, pady=10)
         
         # Header with route type
         header = tk.Frame(card, bg='#3498db')
         header.pack(fill='x')
         
-        strategy_colors = {
-            'Cheapest': '#27ae60',
-            'Fastest': '#e74c3c',
-            'Balanced': '#3498db',
-            'Most Convenient': '#9b59b6'
-        }
-        
-        bg_color = strategy_colors.get(route.get('strategy', 'Balanced'), '#3498db')
-        header.config(bg=bg_color)
-        
-        tk.Label(header,
-                text=f"Option {index}: {route.get('strategy', 'Route')}",
-                font=('Segoe UI', 13, 'bold'),
-                bg=bg_color,
-                fg='white',
-                pady=12).pack()
+        title = tk.Label(header,
+                        font=('Segoe UI', 13, 'bold'),
+                        bg='#3498db',
+                        fg='white',
+                        pady=12)
+        title.pack()
         
         # Metrics row
         metrics_frame = tk.Frame(card, bg='#ecf0f1')
         metrics_frame.pack(fill='x', pady=1)
         
-        metrics = [
-            ("💰", "Cost", f"₹{route.get('total_cost', 0)}", '#27ae60'),
-            ("⏱️", "Time", f"{route.get('total_time', 0)} min", '#e67e22'),
-            ("📏", "Distance", f"{route.get('total_distance', 0)} km", '#3498db'),
-            ("🔄", "Segments", str(route.get('num_segments', 0)), '#9b59b6')
-        ]
-        
-        for icon, label, value, color in metrics:
+        metric_values = []
+        for icon, label, color in self.CARD_METRICS:
             metric_box = tk.Frame(metrics_frame, bg='white', relief='solid', borderwidth=1)
             metric_box.pack(side='left', expand=True, fill='both', padx=2, pady=5)
             
@@ -616,11 +844,12 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
                     font=('Segoe UI', 16),
                     bg='white').pack()
             
-            tk.Label(metric_box,
-                    text=value,
-                    font=('Segoe UI', 12, 'bold'),
-                    fg=color,
-                    bg='white').pack()
+            value = tk.Label(metric_box,
+                            font=('Segoe UI', 12, 'bold'),
+                            fg=color,
+                            bg='white')
+            value.pack()
+            metric_values.append(value)
             
             tk.Label(metric_box,
                     text=label,
@@ -638,70 +867,111 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
                 bg='white',
                 fg='#2c3e50').pack(anchor='w', pady=(0, 8))
         
+        # Steps are rendered as tagged lines in one Text widget
+        steps_text = tk.Text(details_frame,
+                             font=('Segoe UI', 10),
+                             bg='#f8f9fa',
+                             relief='flat',
+                             highlightthickness=0,
+                             wrap='none',
+                             cursor='arrow',
+                             padx=10,
+                             pady=5)
+        steps_text.tag_configure('start', font=('Segoe UI', 10, 'bold'), foreground='#27ae60')
+        steps_text.tag_configure('arrive', font=('Segoe UI', 10, 'bold'), foreground='#e74c3c')
+        steps_text.tag_configure('step', font=('Segoe UI', 10), foreground='#2c3e50')
+        steps_text.tag_configure('detail', font=('Segoe UI', 8), foreground='#7f8c8d',
+                                 spacing3=4)
+        steps_text.pack(fill='x', pady=2)
+        
+        # Transport modes summary
+        modes_frame = tk.Frame(card, bg='#f8f9fa', relief='solid', borderwidth=1)
+        modes_frame.pack(fill='x', padx=10, pady=(5, 10))
+        
+        modes_label = tk.Label(modes_frame,
+                              font=('Segoe UI', 9),
+                              bg='#f8f9fa',
+                              fg='#34495e')
+        modes_label.pack(pady=8, padx=10)
+        
+        return {
+            'frame': card,
+            'header': header,
+            'title': title,
+            'metrics': metric_values,
+            'steps': steps_text,
+            'modes': modes_label
+        }
+    
+    def _fill_route_card(self, card, route, index):
+        """Update a route card's widgets for one route alternative"""
+        bg_color = self.STRATEGY_COLORS.get(route.get('strategy', 'Balanced'), '#3498db')
+        card['header'].config(bg=bg_color)
+        card['title'].config(text=f"Option {index}: {route.get('strategy', 'Route')}", bg=bg_color)
+        
+        # Metrics row
+        values = [
+            f"₹{route.get('total_cost', 0)}",
+            f"{route.get('total_time', 0)} min",
+            f"{route.get('total_distance', 0)} km",
+            str(route.get('num_segments', 0))
+        ]
+        for label, value in zip(card['metrics'], values):
+            label.config(text=value)
+        
         # Each step
+        mode_icons = self.MODE_ICONS
         path = route.get('path', [])
+        last = len(path)
+        steps_text = card['steps']
+        steps_text.config(state='normal')
+        steps_text.delete('1.0', 'end')
+        
+        num_lines = 0
         for j, step in enumerate(path, 1):
-            step_frame = tk.Frame(details_frame, bg='#f8f9fa')
-            step_frame.pack(fill='x', pady=2)
-            
-            mode_icons = {
-                'start': '🏁',
-                'metro': '🚇',
-                'bus': '🚌',
-                'auto': '🛺',
-                'walk': '🚶'
-            }
-            
             mode = step.get('mode', 'walk')
+            loc = step.get('location', 'Unknown')
             icon = mode_icons.get(mode, '→')
             
             if j == 1:
                 # Starting point
-                tk.Label(step_frame,
-                        text=f"{j}. {icon} START: {step.get('location', 'Unknown')}",
-                        font=('Segoe UI', 10, 'bold'),
-                        bg='#f8f9fa',
-                        fg='#27ae60',
-                        anchor='w').pack(fill='x', padx=10, pady=5)
-            elif j == len(path):
+                steps_text.insert('end', f"{j}. {icon} START: {loc}\n", 'start')
+                num_lines += 1
+            elif j == last:
                 # End point
-                tk.Label(step_frame,
-                        text=f"{j}. 🏁 ARRIVE: {step.get('location', 'Unknown')}",
-                        font=('Segoe UI', 10, 'bold'),
-                        bg='#f8f9fa',
-                        fg='#e74c3c',
-                        anchor='w').pack(fill='x', padx=10, pady=5)
+                steps_text.insert('end', f"{j}. 🏁 ARRIVE: {loc}\n", 'arrive')
+                num_lines += 1
             else:
                 # Intermediate step
-                main_text = tk.Label(step_frame,
-                                    text=f"{j}. {icon} {step.get('location', 'Unknown')}",
-                                    font=('Segoe UI', 10),
-                                    bg='#f8f9fa',
-                                    fg='#2c3e50',
-                                    anchor='w')
-                main_text.pack(fill='x', padx=10, pady=(5, 2))
-                
-                detail_text = tk.Label(step_frame,
-                                      text=f"    via {mode.upper()}: {step.get('segment_time', 0)} min, "
-                                           f"₹{step.get('segment_cost', 0)}, {step.get('segment_distance', 0)} km",
-                                      font=('Segoe UI', 8),
-                                      bg='#f8f9fa',
-                                      fg='#7f8c8d',
-                                      anchor='w')
-                detail_text.pack(fill='x', padx=10, pady=(0, 5))
+                seg_time = step.get('segment_time', 0)
+                seg_cost = step.get('segment_cost', 0)
+                seg_dist = step.get('segment_distance', 0)
+                steps_text.insert('end', f"{j}. {icon} {loc}\n", 'step')
+                steps_text.insert('end',
+                                  f"    via {mode.upper()}: {seg_time} min, "
+                                  f"₹{seg_cost}, {seg_dist} km\n",
+                                  'detail')
+                num_lines += 2
+        
+        # Drop the trailing newline and size the widget to its content
+        steps_text.delete('end-2c', 'end-1c')
+        longest = max((len(line) for line in steps_text.get('1.0', 'end-1c').split('\n')), default=0)
+        steps_text.config(height=max(num_lines, 1), width=longest + 2, state='disabled')
         
         # Transport modes summary
-        modes_frame = tk.Frame(card, bg='#f8f9fa', relief='solid', borderwidth=1)
-        modes_frame.pack(fill='x', padx=10, pady=(5, 10))
-        
-        modes_used = set([s.get('mode', 'walk') for s in path if s.get('mode') != 'start'])
+        modes_used = {s.get('mode', 'walk') for s in path}
+        modes_used.discard('start')
         modes_text = ', '.join([m.upper() for m in modes_used]) if modes_used else 'None'
-        
-        tk.Label(modes_frame,
-                text=f"🎯 Transport Modes Used: {modes_text}",
-                font=('Segoe UI', 9),
-                bg='#f8f9fa',
-                fg='#34495e').pack(pady=8, padx=10)
+        card['modes'].config(text=f"🎯 Transport Modes Used: {modes_text}")
+    
+    def _clear_results(self):
+        """Empty the results area: pooled route cards are hidden, anything else destroyed"""
+        pooled = {card['frame'] for card in self._card_pool}
+        for widget in self.results_container.winfo_children():
+            if widget in pooled:
+                widget.pack_forget()
+            else:
+                widget.destroy()
     
     def show_interactive_map(self):
         """Generate and show interactive Folium map"""
@@ -709,74 +979,144 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
             messagebox.showwarning("No Routes", "Please calculate routes first")
             return
         
+        # Routes are fixed for a (start, end) pair, so reuse its rendered map
+        key = self._map_id(self.current_start, self.current_end)
+        if key in self._map_cache:
+            self._map_cache.move_to_end(key)
+            self._open_map(key, None)
+            return
+        
+        # Building and rendering the map is slow; keep it off the Tk thread
+        self.view_map_btn.config(state='disabled', text="Generating map...")
+        self._map_pending = key
+        self._executor.submit(self._build_map_thread, key, self.current_routes)
+    
+    def _build_map_thread(self, key, routes):
+        """Thread function for map generation"""
         try:
-            # Create map centered on Kochi
-            kochi_center = [10.0261, 76.2750]
-            route_map = folium.Map(location=kochi_center, zoom_start=12)
-            
-            # Color scheme for different routes
-            colors = ['blue', 'red', 'green', 'purple', 'orange']
-            
-            # Add routes
-            for i, route in enumerate(self.current_routes):
-                path = route.get('path', [])
-                color = colors[i % len(colors)]
-                
-                # Get coordinates for route
-                route_coords = []
-                for step in path:
-                    loc_name = step.get('location', '')
-                    if loc_name in self.optimizer.locations:
-                        loc_data = self.optimizer.locations[loc_name]
-                        route_coords.append([loc_data['lat'], loc_data['lon']])
-                
-                # Draw route line
-                if len(route_coords) > 1:
-                    folium.PolyLine(
-                        route_coords,
-                        color=color,
-                        weight=4,
-                        opacity=0.7,
-                        popup=f"Route {i+1}: {route.get('strategy', 'Route')}"
-                    ).add_to(route_map)
-                
-                # Add markers
-                for j, step in enumerate(path):
-                    loc_name = step.get('location', '')
-                    if loc_name in self.optimizer.locations:
-                        loc_data = self.optimizer.locations[loc_name]
-                        
-                        # Icon based on position
-                        if j == 0:
-                            icon = folium.Icon(color='green', icon='play', prefix='fa')
-                            popup_text = f"START: {loc_name}"
-                        elif j == len(path) - 1:
-                            icon = folium.Icon(color='red', icon='stop', prefix='fa')
-                            popup_text = f"END: {loc_name}"
-                        else:
-                            icon = folium.Icon(color=color, icon='circle', prefix='fa')
-                            mode = step.get('mode', 'unknown')
-                            popup_text = f"{loc_name}<br>via {mode.upper()}"
-                        
-                        folium.Marker(
-                            [loc_data['lat'], loc_data['lon']],
-                            popup=popup_text,
-                            icon=icon
-                        ).add_to(route_map)
+            html = self._build_route_map(routes).get_root().render()
+            self.root.after(0, self._map_built, key, html.encode('utf-8'), None)
+        except Exception as e:
+            self.root.after(0, self._map_built, key, None, str(e))
+    
+    def _map_built(self, key, data, error_message):
+        """Handle a finished map build, unless the routes it was for have been replaced"""
+        if key != self._map_pending:
+            return
+        self._map_pending = None
+        
+        if error_message is None:
+            self._open_map(key, data)
+        else:
+            self._show_map_error(error_message)
+    
+    def _map_id(self, start, end):
+        """Stable id for a (start, end) pair's map, used in its URL"""
+        return hashlib.sha1(f"{start}\0{end}".encode('utf-8')).hexdigest()[:16]
+    
+    def _open_map(self, key, data):
+        """Serve a map locally and open it in the browser; data is None if already cached"""
+        self.view_map_btn.config(state='normal', text=self.MAP_BUTTON_TEXT)
+        if data is not None:
+            self._map_cache[key] = data
+            if len(self._map_cache) > self.MAP_CACHE_SIZE:
+                self._map_cache.popitem(last=False)
+        
+        try:
+            import webbrowser
             
-            # Save map
-            map_path = Path.cwd() / "route_map.html"
-            route_map.save(str(map_path))
+            # Maps are served from memory, so nothing is written to disk.
+            # Each has its own URL, so earlier tabs keep showing their route
+            if self._map_server is None:
+                self._map_server = _MapServer(self._map_cache)
+            url = self._map_server.url(key)
             
             # Open in browser
-            webbrowser.open('file://' + str(map_path.absolute()))
+            webbrowser.open(url)
             
-            messagebox.showinfo("Map Generated", 
-                              f"Interactive map opened in your browser!\n"
-                              f"Saved at: {map_path}")
+            self.root.after_idle(self.status_var.set,
+                                 f"Interactive map opened in your browser at {url}")
             
         except Exception as e:
-            messagebox.showerror("Map Error", f"Error generating map:\n{str(e)}")
+            self._show_map_error(str(e))
+    
+    def _show_map_error(self, error_message):
+        """Show map generation error"""
+        self.view_map_btn.config(state='normal', text=self.MAP_BUTTON_TEXT)
+        messagebox.showerror("Map Error", f"Error generating map:\n{error_message}")
+    
+    def _build_route_map(self, routes):
+        """Build the Folium map of the given routes"""
+        # folium (with jinja2 and branca) is only loaded once a map is wanted
+        import folium
+        from folium.plugins import MarkerCluster
+        
+        # Create map centered on Kochi
+        kochi_center = [10.0261, 76.2750]
+        # Canvas rendering paints all lines and circle markers in one layer
+        route_map = folium.Map(location=kochi_center, zoom_start=12, prefer_canvas=True)
+        
+        coords = self._coords
+        
+        # Add routes, each as one layer holding its line and stops
+        for i, (route, color) in enumerate(zip(routes, cycle(self.ROUTE_COLORS))):
+            path = route.get('path', [])
+            stop_style = {'radius': 6, 'color': color, 'fill': True, 'fill_opacity': 0.9}
+            strategy = route.get('strategy', 'Route')
+            group = folium.FeatureGroup(name=f"Route {i+1}: {strategy}")
+            
+            # Resolve each step's coordinates once, for both the line and the stops
+            points = [(step, coords.get(step.get('location'))) for step in path]
+            route_coords = simplify_path([point for _, point in points if point is not None],
+                                         self.LINE_EPSILON)
+            
+            # Draw route line
+            if len(route_coords) > 1:
+                folium.PolyLine(
+                    route_coords,
+                    color=color,
+                    weight=4,
+                    opacity=0.7,
+                    smooth_factor=1.5,
+                    popup=f"Route {i+1}: {strategy}"
+                ).add_to(group)
+            
+            # Intermediate stops as plain circles; no icon markup per stop.
+            # Long itineraries are clustered so only visible stops are drawn
+            stops = points[1:-1]
+            parent = group
+            if len(stops) > self.CLUSTER_MIN_STOPS:
+                parent = MarkerCluster(options={'chunkedLoading': True,
+                                                'disableClusteringAtZoom': 16}).add_to(group)
+            for step, point in stops:
+                if point is not None:
+                    mode = step.get('mode', 'unknown')
+                    folium.CircleMarker(
+                        point,
+                        popup=f"{step['location']}<br>via {mode.upper()}",
+                        **stop_style
+                    ).add_to(parent)
+            
+            group.add_to(route_map)
+        
+        # Every route shares the same endpoints, so mark them once
+        path = next((r.get('path') for r in routes if r.get('path')), [])
+        endpoints = []
+        if path:
+            endpoints.append((path[0], "START", 'green', 'play'))
+        if len(path) > 1:
+            endpoints.append((path[-1], "END", 'red', 'stop'))
+        for step, label, color, icon in endpoints:
+            loc_name = step.get('location', '')
+            point = coords.get(loc_name)
+            if point is not None:
+                folium.Marker(
+                    point,
+                    popup=f"{label}: {loc_name}",
+                    icon=folium.Icon(color=color, icon=icon, prefix='fa')
+                ).add_to(route_map)
+        
+        return route_map
     
     def open_google_maps(self):
         """Open route in Google Maps"""
@@ -785,77 +1125,78 @@ Transport Modes: 4 (Metro, Bus, Auto, Walk)"""
             return
         
         try:
-            # Get coordinates
-            start_loc = self.optimizer.locations[self.current_start]
-            end_loc = self.optimizer.locations[self.current_end]
+            import webbrowser
             
-            # Create Google Maps URL for directions
-            start_coords = f"{start_loc['lat']},{start_loc['lon']}"
-            end_coords = f"{end_loc['lat']},{end_loc['lon']}"
+            # Endpoint coordinates were formatted when the routes were shown
+            start_coords = self._start_ll
+            end_coords = self._end_ll
             
-            # Build URL with waypoints if available
-            if self.current_routes and len(self.current_routes) > 0:
-                # Get first route's path
-                route = self.current_routes[0]
-                path = route.get('path', [])
-                
-                # Get waypoints (middle locations)
-                waypoints = []
-                for i, step in enumerate(path[1:-1]):  # Skip first and last
-                    loc_name = step.get('location', '')
-                    if loc_name in self.optimizer.locations:
-                        loc_data = self.optimizer.locations[loc_name]
-                        waypoints.append(f"{loc_data['lat']},{loc_data['lon']}")
-                
-                # Build Google Maps URL
-                if waypoints:
-                    waypoints_str = "|".join(waypoints[:5])  # Google Maps limits waypoints
-                    gmaps_url = (f"https://www.google.com/maps/dir/?api=1"
-                               f"&origin={start_coords}"
-                               f"&destination={end_coords}"
-                               f"&waypoints={waypoints_str}"
-                               f"&travelmode=transit")
-                else:
-                    gmaps_url = (f"https://www.google.com/maps/dir/?api=1"
-                               f"&origin={start_coords}"
-                               f"&destination={end_coords}"
-                               f"&travelmode=transit")
-            else:
-                gmaps_url = (f"https://www.google.com/maps/dir/?api=1"
-                           f"&origin={start_coords}"
-                           f"&destination={end_coords}"
-                           f"&travelmode=transit")
+            # Waypoints: the first route's middle locations, up to the
+            # 5 Google Maps accepts
+            waypoints = []
+            if self.current_routes:
+                path = self.current_routes[0].get('path', [])
+                coords = self._coords
+                middle = (coords[s['location']] for s in path[1:-1] if s.get('location') in coords)
+                waypoints = [f"{lat},{lon}" for lat, lon in islice(middle, 5)]
+            
+            # Build Google Maps URL
+            params = {'api': '1', 'origin': start_coords, 'destination': end_coords}
+            if waypoints:
+                params['waypoints'] = '|'.join(waypoints)
+            params['travelmode'] = 'transit'
+            gmaps_url = "https://www.google.com/maps/dir/?" + urlencode(params, safe=',|')
             
             # Open in browser
             webbrowser.open(gmaps_url)
             
-            messagebox.showinfo("Google Maps", 
-                              "Route opened in Google Maps!\n"
-                              "You can see real-time traffic and alternative routes.")
+            self.root.after_idle(self.status_var.set,
+                                 "Route opened in Google Maps. "
+                                 "You can see real-time traffic and alternative routes.")
             
         except Exception as e:
             messagebox.showerror("Google Maps Error", 
                                f"Error opening Google Maps:\n{str(e)}")
     
+    def _on_close(self):
+        """Drop queued background work and close the window"""
+        try:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:  # cancel_futures is Python 3.9+
+            self._executor.shutdown(wait=False)
+        if self._map_server is not None:
+            self._map_server.close()
+        self.root.destroy()
+    
     def _show_error(self, error_message):
         """Show error message"""
         self.progress.stop()
         self.progress.pack_forget()
         self.calculate_btn.config(state='normal', text="🔍 Find Optimal Routes")
+        self._clear_results()
         messagebox.showerror("Error", f"An error occurred:\n{error_message}")
 
 def main():
     """Main function to run the GUI"""
-    root = tk.Tk()
+    # Without a display Tk cannot start, and neither can an error dialog
+    if (sys.platform.startswith('linux')
+            and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY')):
+        print("Error: No display available to run the GUI", file=sys.stderr)
+        return 1
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Error: Could not start the GUI: {e}", file=sys.stderr)
+        return 1
     
     try:
         app = LocationRouteGUI(root)
         
-        # Center window
-        root.update_idletasks()
-        x = (root.winfo_screenwidth() // 2) - (root.winfo_width() // 2)
-        y = (root.winfo_screenheight() // 2) - (root.winfo_height() // 2)
-        root.geometry(f"+{x}+{y}")
+        # Center window; its size is known, so no layout pass is forced first
+        x = (root.winfo_screenwidth() - app.WIDTH) // 2
+        y = (root.winfo_screenheight() - app.HEIGHT) // 2
+        root.geometry(f"{app.WIDTH}x{app.HEIGHT}+{x}+{y}")
         
         # Set minimum size
         root.minsize(1200, 800)
@@ -869,4 +1210,4 @@ def main():
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file